@@ -1,3 +1,4 @@
+import os
 from flask import Flask
 from flask_cors import CORS
 from config import Config
@@ -6,9 +7,8 @@ from routes.scraping_routes import scraping_bp
 from routes.image_routes import image_bp
 from routes.blog_routes import blog_bp
 from routes.batch_routes import batch_bp
-from flask import Flask
-from flask_cors import CORS
-from config import Config  # Add this import
+from utils.db import ensure_indexes, ensure_product_knowledge, missing_indexes
+from services.batch_queue import start_batch_workers
 
 app = Flask(__name__)
 CORS(app, origins=Config.CORS_ORIGINS)
@@ -20,9 +20,41 @@ app.register_blueprint(image_bp, url_prefix='/api')
 app.register_blueprint(blog_bp, url_prefix='/api')
 app.register_blueprint(batch_bp, url_prefix='/api')  # Add this line
 
+# Make sure every lookup path is indexed and the defaults exist before serving requests
+ensure_indexes()
+ensure_product_knowledge()
+
+
+def start_background_workers():
+    """Drain the shared batch queue, resuming jobs a previous process left unfinished.
+
+    Must only run in the process that serves requests: batch workers, the
+    Gemini rate limiter and the stage semaphores are all per process.
+    """
+    if Config.BATCH_WORKERS_ENABLED:
+        start_batch_workers()
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return {"status": "healthy"}, 200
 
+@app.route('/health/indexes', methods=['GET'])
+def index_health_check():
+    try:
+        missing = missing_indexes()
+    except Exception as e:
+        return {"status": "unknown", "error": str(e)}, 503
+    
+    if missing:
+        return {"status": "missing_indexes", "missing": missing}, 503
+    return {"status": "healthy", "missing": []}, 200
+
 if __name__ == '__main__':
-    app.run(debug=True, port=Config.PORT)
\ No newline at end of file
+    # The debug reloader runs this file in a watcher process and again in the
+    # serving child; only the child (WERKZEUG_RUN_MAIN) may start workers
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
+    app.run(debug=True, port=Config.PORT)
+else:
+    # Imported by gunicorn (see gunicorn.conf.py: a single serving process)
+    start_background_workers()
\ No newline at end of file
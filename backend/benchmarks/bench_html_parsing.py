@@ -0,0 +1,60 @@
+"""Time a full BeautifulSoup parse against the strained make_soup parse.
+
+Run from backend/:  python -m benchmarks.bench_html_parsing [repeat]
+
+Uses the saved result pages in tests/fixtures, each padded with the kind of
+scripts and navigation a live page carries, so the strainer has something
+to skip.
+"""
+import os
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from utils.html_parsing import HTML_PARSER, make_soup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures")
+
+# fixture, element name, class token
+CASES = [
+    ("duckduckgo_serp.html", "div", "web-result"),
+    ("bing_serp.html", "li", "b_algo"),
+    ("pexels_search.html", "img", "photo-item__img"),
+    ("bing_images.html", "a", "iusc"),
+]
+
+PAGE_PADDING = (
+    "<script>var config = {" + "'k': 'v', " * 2000 + "};</script>"
+    + "<nav>" + "<ul><li><a href='/x'>Link</a></li></ul>" * 400 + "</nav>"
+)
+
+
+def _load(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        markup = f.read()
+    return markup.replace("</body>", PAGE_PADDING + "</body>", 1)
+
+
+def main(repeat=20):
+    print(f"parser: {HTML_PARSER}, {repeat} runs each")
+    for fixture, name, class_ in CASES:
+        markup = _load(fixture)
+        full = timeit.timeit(
+            lambda: BeautifulSoup(markup, HTML_PARSER).find_all(name, class_=class_),
+            number=repeat,
+        )
+        strained = timeit.timeit(
+            lambda: make_soup(markup, name, class_=class_).find_all(name, class_=class_),
+            number=repeat,
+        )
+        print(
+            f"{fixture:24} {len(markup) // 1024:4d}KB  "
+            f"full {full / repeat * 1000:7.2f}ms  "
+            f"strained {strained / repeat * 1000:7.2f}ms  "
+            f"x{full / strained:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
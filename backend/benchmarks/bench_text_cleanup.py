@@ -0,0 +1,76 @@
+"""Time the precompiled meta-commentary pipeline against the original rules.
+
+Run from backend/:  python -m benchmarks.bench_text_cleanup [size_kb ...]
+
+The original method ran each rule below with re.sub, one after another.
+Several rules start with ``.*`` under DOTALL, so on text they do not match
+they retry from every position and take quadratic time; keep sizes small
+(the default is 2 and 8 KB) or the baseline runs for minutes.
+"""
+import random
+import re
+import sys
+import timeit
+
+from utils.text_cleanup import META_COMMENTARY
+
+ORIGINAL_META_COMMENTARY = [
+    r'\*\*[^*]+\*\*[^*]*explanation[^.]*\.',
+    r'Key improvements and explanations:.*',
+    r'The code is properly formatted.*',
+    r'Uses Font Awesome icons.*',
+    r'Added.*target="_blank".*',
+    r'This is generally good UX.*',
+    r'Benefits Page Link.*',
+    r'Contact Information Formatting.*',
+    r'CSS Styling.*',
+    r'Complete and Working.*',
+    r'Word Count.*',
+    r'Emoji Usage.*',
+    r'Improved Tone.*',
+    r'Emphasis on Action.*',
+    r'Mobile-Friendly.*',
+    r'The critical addition is.*',
+    r'.*adheres to all requirements.*',
+    r'.*incorporates best practices.*',
+    r'.*FontAwesome.*CSS.*',
+]
+
+BLOG_PARTS = [
+    "<p>Welding joins **metal** parts with *heat*.</p>\n",
+    "Plain sentences about welding technique and safety. ",
+    "\n\n",
+    "<ul><li>Wear a helmet</li></ul>\n",
+]
+
+
+def original_meta_commentary(content):
+    for pattern in ORIGINAL_META_COMMENTARY:
+        content = re.sub(pattern, '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'\*\s*\*\*[^*]+\*\*[^.]*\.', '', content, flags=re.DOTALL)
+    content = re.sub(r'\n{3,}', '\n\n', content)
+    return content.strip()
+
+
+def blog_text(size):
+    rng = random.Random(size)
+    text = ""
+    while len(text) < size:
+        text += rng.choice(BLOG_PARTS)
+    return text
+
+
+def main(sizes_kb):
+    for size_kb in sizes_kb:
+        text = blog_text(size_kb * 1024)
+        assert original_meta_commentary(text) == META_COMMENTARY(text).strip()
+        original = timeit.timeit(lambda: original_meta_commentary(text), number=1)
+        pipeline = timeit.timeit(lambda: META_COMMENTARY(text).strip(), number=20) / 20
+        print(
+            f"{size_kb:4d}KB  original {original * 1000:9.2f}ms  "
+            f"pipeline {pipeline * 1000:7.2f}ms  x{original / pipeline:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [2, 8])
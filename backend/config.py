@@ -15,6 +15,59 @@ class Config:
     BRAVE_API_KEY = os.getenv('BRAVE_API_KEY')
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     
+    # Batch processing concurrency
+    BATCH_DEFAULT_WORKERS = int(os.getenv('BATCH_DEFAULT_WORKERS', 3))  # Keyword sets in flight per job
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 8))
+    BATCH_WORKER_THREADS = int(os.getenv('BATCH_WORKER_THREADS', 4))  # Queue workers per process, shared by all jobs
+    BATCH_WORKERS_ENABLED = os.getenv('BATCH_WORKERS_ENABLED', 'true').lower() == 'true'  # Set false on extra web processes
+    BATCH_LEASE_SECONDS = int(os.getenv('BATCH_LEASE_SECONDS', 600))  # Item lease, renewed at every pipeline stage
+    BATCH_MAX_ATTEMPTS = int(os.getenv('BATCH_MAX_ATTEMPTS', 3))  # Leases an item may take before it is failed
+    BATCH_QUEUE_POLL_SECONDS = float(os.getenv('BATCH_QUEUE_POLL_SECONDS', 2.0))
+    BATCH_RETRY_DELAY_SECONDS = int(os.getenv('BATCH_RETRY_DELAY_SECONDS', 60))  # Base delay before a failed item is retried, times attempts
+    BATCH_EVENTS_POLL_SECONDS = float(os.getenv('BATCH_EVENTS_POLL_SECONDS', 5.0))  # Quiet time before an event stream re-reads MongoDB
+    BATCH_STATUS_FLUSH_SECONDS = float(os.getenv('BATCH_STATUS_FLUSH_SECONDS', 2.0))  # Coalescing window for batch job status writes
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 4))  # Process-wide Gemini calls in flight
+    SCRAPE_MAX_CONCURRENCY = int(os.getenv('SCRAPE_MAX_CONCURRENCY', 2))  # Process-wide scrape/image searches in flight
+    
+    # Outbound HTTP (scraping and image search)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 20))  # Hosts kept in the connection pool
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 20))  # Keep-alive connections per host
+    SCRAPE_HOST_MIN_INTERVAL = float(os.getenv('SCRAPE_HOST_MIN_INTERVAL', 1.0))  # Seconds between requests to one host
+    SCRAPE_HOST_MAX_CONCURRENCY = int(os.getenv('SCRAPE_HOST_MAX_CONCURRENCY', 2))
+    SCRAPE_MAX_WORKERS = int(os.getenv('SCRAPE_MAX_WORKERS', 8))  # Fetch threads per keyword batch
+    HTML_PARSER = os.getenv('HTML_PARSER', 'lxml')  # BeautifulSoup backend for SERP pages: lxml or html.parser
+    IMAGE_VALIDATION_WORKERS = int(os.getenv('IMAGE_VALIDATION_WORKERS', 8))  # Concurrent HEAD checks per search
+    IMAGE_VALIDATION_HOST_CONCURRENCY = int(os.getenv('IMAGE_VALIDATION_HOST_CONCURRENCY', 4))
+    
+    # Gemini request pacing (token bucket tuned to the API quota). The bucket and
+    # the stage semaphores above are per process: N serving processes send up to
+    # N x GEMINI_REQUESTS_PER_MINUTE, so divide the quota when running more than
+    # the single process gunicorn.conf.py starts.
+    GEMINI_REQUESTS_PER_MINUTE = float(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 60))
+    GEMINI_BURST = int(os.getenv('GEMINI_BURST', 5))
+    
+    # LLM response cache (memory LRU + MongoDB tier)
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 500))
+    LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+    
+    # Image URL validation cache (memory LRU + MongoDB tier)
+    IMAGE_VALIDATION_CACHE_ENABLED = os.getenv('IMAGE_VALIDATION_CACHE_ENABLED', 'true').lower() == 'true'
+    IMAGE_VALIDATION_CACHE_MAX_ENTRIES = int(os.getenv('IMAGE_VALIDATION_CACHE_MAX_ENTRIES', 5000))
+    IMAGE_VALIDATION_POSITIVE_TTL_SECONDS = int(os.getenv('IMAGE_VALIDATION_POSITIVE_TTL_SECONDS', 7 * 24 * 3600))
+    IMAGE_VALIDATION_NEGATIVE_TTL_SECONDS = int(os.getenv('IMAGE_VALIDATION_NEGATIVE_TTL_SECONDS', 6 * 3600))
+    
+    # SERP cache for scraped search results (memory LRU + MongoDB tier)
+    SERP_CACHE_ENABLED = os.getenv('SERP_CACHE_ENABLED', 'true').lower() == 'true'
+    SERP_CACHE_MAX_ENTRIES = int(os.getenv('SERP_CACHE_MAX_ENTRIES', 1000))
+    SERP_CACHE_FRESHNESS_SECONDS = int(os.getenv('SERP_CACHE_FRESHNESS_SECONDS', 24 * 3600))
+    
+    # Blog generation sessions are removed by a MongoDB TTL index after this long
+    GENERATION_SESSION_TTL_SECONDS = int(os.getenv('GENERATION_SESSION_TTL_SECONDS', 2 * 3600))
+    
+    # How often the shared BlogGenerator checks product_knowledge for changes
+    PRODUCT_KNOWLEDGE_REFRESH_SECONDS = int(os.getenv('PRODUCT_KNOWLEDGE_REFRESH_SECONDS', 60))
+    
     # CORS settings for production
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'https://blog-generator-three-nu.vercel.app,http://localhost:3000').split(',')
 
@@ -0,0 +1,18 @@
+# Gunicorn settings for the API container.
+#
+# One process on purpose: batch workers, the Gemini token bucket and the stage
+# semaphores live in the serving process, so every extra process would add
+# another set of workers and another full Gemini rate budget. Requests are
+# served by threads instead, which also lets long-lived responses (the
+# /batch-events stream and /batch-export ZIPs) run without tying up the
+# process; with gthread the timeout only applies to the worker heartbeat,
+# not to individual requests.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 32))
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
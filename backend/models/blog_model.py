@@ -1,5 +1,23 @@
 from datetime import datetime
 from bson import ObjectId
+import hashlib
+import json
+import zlib
+
+# Every field that has ever held a rendition of the blog HTML. New documents
+# only write html_content, original_html and publish_ready_html; the others
+# are read for documents stored before the compact format.
+HTML_FIELDS = ("html_content", "original_html", "enhanced_html",
+               "html_with_images", "publish_ready_html", "final_html")
+
+# Download renditions rendered once by generate_metadata, stored like the HTML
+RENDITION_FIELDS = {"txt": "download_txt", "json": "download_json"}
+
+# Every field that may hold packed (possibly compressed) text
+PACKED_FIELDS = HTML_FIELDS + tuple(RENDITION_FIELDS.values())
+
+# HTML at least this large is stored zlib-compressed (as BSON binary)
+COMPRESS_MIN_BYTES = 1024
 
 class BlogModel:
     @staticmethod
@@ -14,15 +32,15 @@ class BlogModel:
             "content_sections": blog_data.get('content_sections', []),
             "cta": blog_data.get('cta', ''),
             "conclusion": blog_data.get('conclusion', ''),
-            "html_content": html_content,
+            "html_content": BlogModel.pack_html(html_content),
             "generation_step": blog_data.get('current_step', 'completed'),
             "created_at": datetime.utcnow(),
             "status": "draft"
         }
         
-        # Add original HTML if provided
-        if original_html:
-            blog_doc["original_html"] = original_html
+        # Keep the pre-enhancement version only when it actually differs
+        if original_html and original_html != html_content:
+            blog_doc["original_html"] = BlogModel.pack_html(original_html)
         
         return blog_doc
     
@@ -35,9 +53,143 @@ class BlogModel:
         }
         return update_data
     
+    @staticmethod
+    def pack_html(html):
+        """Return HTML ready for storage: compressed bytes when large, else the string itself"""
+        if not html:
+            return html
+        data = html.encode('utf-8')
+        if len(data) < COMPRESS_MIN_BYTES:
+            return html
+        return zlib.compress(data, 6)
+    
+    @staticmethod
+    def unpack_html(value):
+        """Inverse of pack_html; plain strings pass through unchanged"""
+        if isinstance(value, (bytes, bytearray)):
+            return zlib.decompress(value).decode('utf-8')
+        return value or ""
+    
+    @staticmethod
+    def body_html(blog_doc):
+        """The current blog body (with images once integrated), before publish wrapping"""
+        for field in ("html_with_images", "enhanced_html", "html_content", "original_html"):
+            if blog_doc.get(field):
+                return BlogModel.unpack_html(blog_doc[field])
+        return ""
+    
+    @staticmethod
+    def publish_html(blog_doc):
+        """The publish-ready HTML, or an empty string until metadata is generated"""
+        for field in ("publish_ready_html", "final_html"):
+            if blog_doc.get(field):
+                return BlogModel.unpack_html(blog_doc[field])
+        return ""
+    
+    @staticmethod
+    def best_html(blog_doc):
+        """The most finished HTML available for the blog"""
+        return BlogModel.publish_html(blog_doc) or BlogModel.body_html(blog_doc)
+    
+    @staticmethod
+    def text_rendition(blog_doc, html_content=None):
+        """Plain-text download: a metadata header followed by the blog text"""
+        from bs4 import BeautifulSoup
+
+        if html_content is None:
+            html_content = BlogModel.best_html(blog_doc)
+        soup = BeautifulSoup(html_content, "html.parser")
+
+        return (
+            f"POST TITLE: {blog_doc.get('post_title', blog_doc.get('title', ''))}\n"
+            f"META TITLE: {blog_doc.get('meta_title', '')}\n"
+            f"META DESCRIPTION: {blog_doc.get('meta_description', '')}\n"
+            f"POST DESCRIPTION: {blog_doc.get('post_description', '')}\n"
+            f"SLUG: {blog_doc.get('slug', '')}\n"
+            f"FEATURED IMAGE: {blog_doc.get('featured_image', {}).get('url', '')}\n"
+            f"KEYWORDS: {blog_doc.get('meta_keywords', '')}\n\n"
+            "=====================================\n"
+            "BLOG CONTENT\n"
+            "=====================================\n\n"
+            + soup.get_text(separator="\n", strip=True)
+        )
+    
+    @staticmethod
+    def json_rendition(blog_doc, html_content=None):
+        """JSON download: all publishing metadata plus the HTML"""
+        if html_content is None:
+            html_content = BlogModel.best_html(blog_doc)
+
+        metadata = {
+            "post_title": blog_doc.get("post_title", blog_doc.get("title", "")),
+            "meta_title": blog_doc.get("meta_title", ""),
+            "meta_description": blog_doc.get("meta_description", ""),
+            "post_description": blog_doc.get("post_description", ""),
+            "slug": blog_doc.get("slug", ""),
+            "featured_image": blog_doc.get("featured_image", {}),
+            "meta_keywords": blog_doc.get("meta_keywords", ""),
+            "author": blog_doc.get("author", ""),
+            "canonical_url": blog_doc.get("canonical_url", ""),
+            "word_count": blog_doc.get("word_count", 0),
+            "html_content": html_content,
+            "created_at": blog_doc.get("created_at", "").isoformat() if blog_doc.get("created_at") else "",
+            "status": blog_doc.get("status", "")
+        }
+        return json.dumps(metadata, indent=2)
+    
+    @staticmethod
+    def render_download(blog_doc, format, html_content):
+        """Render one download format (html, txt or json) from the given HTML"""
+        if format == "txt":
+            return BlogModel.text_rendition(blog_doc, html_content)
+        if format == "json":
+            return BlogModel.json_rendition(blog_doc, html_content)
+        return html_content
+    
+    @staticmethod
+    def build_renditions(blog_doc, html_content):
+        """Render the txt and json downloads once; returns the fields to store.
+
+        renditions_etag is a digest of all three renditions, so it changes
+        whenever any download would.
+        """
+        text_content = BlogModel.text_rendition(blog_doc, html_content)
+        json_content = BlogModel.json_rendition(blog_doc, html_content)
+        digest = hashlib.sha1(
+            "\0".join((html_content, text_content, json_content)).encode("utf-8")
+        ).hexdigest()
+        return {
+            "download_txt": BlogModel.pack_html(text_content),
+            "download_json": BlogModel.pack_html(json_content),
+            "renditions_etag": digest,
+        }
+    
+    @staticmethod
+    def stored_rendition(blog_doc, format):
+        """Return (content, etag) for a stored download, or (None, None) if it was never rendered"""
+        etag = blog_doc.get("renditions_etag")
+        if not etag:
+            return None, None
+        if format == "html":
+            content = BlogModel.publish_html(blog_doc)
+        else:
+            content = BlogModel.unpack_html(blog_doc.get(RENDITION_FIELDS[format]))
+        if not content:
+            return None, None
+        return content, f"{etag}-{format}"
+    
+    @staticmethod
+    def decode_html_fields(blog_doc):
+        """Decompress every stored HTML field in place and return the document"""
+        for field in PACKED_FIELDS:
+            if field in blog_doc:
+                blog_doc[field] = BlogModel.unpack_html(blog_doc[field])
+        return blog_doc
+    
     @staticmethod
     def format_blog_response(blog_doc):
         """Format blog document for API response"""
+        BlogModel.decode_html_fields(blog_doc)
         blog_doc['_id'] = str(blog_doc['_id'])
         blog_doc['keyword_id'] = str(blog_doc['keyword_id'])
         blog_doc['created_at'] = blog_doc['created_at'].isoformat()
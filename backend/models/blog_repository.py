@@ -0,0 +1,114 @@
+from bson import ObjectId
+from utils.db import blogs_collection
+from models.blog_model import HTML_FIELDS, RENDITION_FIELDS
+
+# Renditions BlogModel.best_html can serve; original_html is never returned by these views
+SERVED_HTML_FIELDS = [field for field in HTML_FIELDS if field != "original_html"]
+
+# Computed server-side so the integrated_images array itself is not transferred
+IMAGES_COUNT = {"$size": {"$ifNull": ["$integrated_images", []]}}
+
+# Filename and cache validators shared by the download views
+DOWNLOAD_FIELDS = {"slug": 1, "title": 1, "renditions_etag": 1, "updated_at": 1}
+
+
+class BlogRepository:
+    # Read views: each endpoint lists only the fields it uses. Keys are
+    # projection fields, so find_one returns nothing else over the wire.
+    VIEWS = {
+        "summary": {
+            "title": 1,
+            "slug": 1,
+            "meta_description": 1,
+            "word_count": 1,
+            "status": 1,
+            "created_at": 1,
+            "quality_enhanced": 1,
+            "images_count": IMAGES_COUNT,
+        },
+        "integration_status": {
+            "image_integration_complete": 1,
+            "images_count": IMAGES_COUNT,
+        },
+        "with_images": {
+            **dict.fromkeys(SERVED_HTML_FIELDS, 1),
+            "image_integration_complete": 1,
+            "integrated_images": 1,
+            "status": 1,
+        },
+        "batch_preview": {
+            **dict.fromkeys(SERVED_HTML_FIELDS, 1),
+            "post_title": 1,
+            "title": 1,
+            "meta_title": 1,
+            "slug": 1,
+            "word_count": 1,
+            "status": 1,
+            "created_at": 1,
+            "image_integration_complete": 1,
+            "images_count": IMAGES_COUNT,
+        },
+        "export": {
+            **dict.fromkeys(SERVED_HTML_FIELDS, 1),
+            **dict.fromkeys(RENDITION_FIELDS.values(), 1),
+            "renditions_etag": 1,
+            "updated_at": 1,
+            "keyword_id": 1,
+            "post_title": 1,
+            "title": 1,
+            "meta_title": 1,
+            "meta_description": 1,
+            "post_description": 1,
+            "slug": 1,
+            "featured_image": 1,
+            "meta_keywords": 1,
+            "author": 1,
+            "canonical_url": 1,
+            "word_count": 1,
+            "created_at": 1,
+            "status": 1,
+        },
+        # One view per download format: the stored rendition and its validators
+        "download_html": {
+            "publish_ready_html": 1,
+            "final_html": 1,
+            **DOWNLOAD_FIELDS,
+        },
+        "download_txt": {
+            "download_txt": 1,
+            **DOWNLOAD_FIELDS,
+        },
+        "download_json": {
+            "download_json": 1,
+            **DOWNLOAD_FIELDS,
+        },
+        "publish_html": {
+            "publish_ready_html": 1,
+            "final_html": 1,
+        },
+    }
+
+    @staticmethod
+    def projection(view):
+        """Projection for a named view, or None for the whole document"""
+        if view is None:
+            return None
+        if view not in BlogRepository.VIEWS:
+            raise ValueError(f"Unknown blog view: {view}")
+        return BlogRepository.VIEWS[view]
+
+    @staticmethod
+    def find_by_keyword(keyword_id, view=None):
+        """Return the blog for a keyword batch, projected to the named view (or whole)"""
+        projection = BlogRepository.projection(view)
+        return blogs_collection.find_one({"keyword_id": ObjectId(keyword_id)}, projection)
+
+    @staticmethod
+    def find_by_keywords(keyword_ids, view=None, batch_size=50):
+        """Return one cursor over the blogs for many keyword batches"""
+        projection = BlogRepository.projection(view)
+        return blogs_collection.find(
+            {"keyword_id": {"$in": [ObjectId(keyword_id) for keyword_id in keyword_ids]}},
+            projection,
+            batch_size=batch_size,
+        )
@@ -5,6 +5,9 @@ class ProductKnowledgeModel:
     def get_default_product_knowledge():
         """Get default Shothik AI product knowledge"""
         return {
+            # Bump version (or set updated_at) on every edit so running
+            # generators pick up the new knowledge
+            "version": 1,
             "company_name": "Shothik AI",
             "title": "Shothik AI - AI-Powered Writing Platform",
             "overview": "Shothik AI is a comprehensive AI-powered writing platform that revolutionizes content creation through advanced paraphrasing, humanization, grammar checking, and more.",
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from utils.db import keywords_collection
 from models.keyword_model import KeywordModel
+from services.errors import ServiceError
+from services.keyword_service import create_keyword_batch
 from bson import ObjectId
 import traceback
 
@@ -10,31 +12,19 @@ keyword_bp = Blueprint('keywords', __name__)
 def create_keywords():
     try:
         data = request.json
-        main_keyword = data.get('main_keyword')
-        keywords = data.get('keywords', [])
         
-        # Validation
-        if not main_keyword:
-            return jsonify({"error": "Main keyword is required"}), 400
-        
-        if not keywords or len(keywords) < 4 or len(keywords) > 5:
-            return jsonify({"error": "Please provide 4-5 keywords"}), 400
-        
-        # Create keyword batch
-        keyword_doc = KeywordModel.create_keyword_batch(main_keyword, keywords)
-        
-        # Save to MongoDB
-        result = keywords_collection.insert_one(keyword_doc)
-        keyword_doc['_id'] = result.inserted_id
-        
-        # Format response
-        response = KeywordModel.format_keyword_response(keyword_doc)
+        response = create_keyword_batch(
+            data.get('main_keyword'),
+            data.get('keywords', [])
+        )
         
         return jsonify({
             "message": "Keywords saved successfully",
             "data": response
         }), 201
         
+    except ServiceError as e:
+        return jsonify({"error": str(e)}), e.status_code
     except Exception as e:
         print(f"Error in create_keywords: {str(e)}")
         traceback.print_exc()
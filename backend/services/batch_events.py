@@ -0,0 +1,205 @@
+import json
+import queue
+import threading
+from datetime import datetime
+from config import Config
+from utils.db import batch_jobs_collection, batch_job_items_collection
+
+# Batch monitors subscribe to a job's event stream instead of polling
+# /batch-status. Workers in this process publish stage changes and
+# settlements straight to the broker; anything published elsewhere (another
+# replica's workers) is picked up by a light MongoDB poll whenever the stream
+# has been quiet for BATCH_EVENTS_POLL_SECONDS. Only deltas are sent: the
+# full results list goes out once, in the snapshot that opens the stream.
+# Result events carry their position as the SSE id, so a reconnecting
+# EventSource (which sends it back as Last-Event-ID) only gets the results
+# it has not seen yet.
+
+TERMINAL_JOB_STATUSES = ['completed_successfully', 'completed_with_errors', 'failed']
+
+# Job fields carried by progress events
+PROGRESS_FIELDS = ['status', 'total_keywords', 'processed', 'failed',
+                   'current_keyword', 'current_stage']
+
+# Events a slow subscriber may fall behind by before new ones are dropped;
+# dropped progress is recovered by the next MongoDB sync
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class BatchEventBroker:
+    """In-process fan-out of batch events to the streams subscribed to each job"""
+
+    def __init__(self):
+        self._subscribers = {}  # job_id -> set of queues
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, job_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def publish(self, job_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass
+
+
+batch_events = BatchEventBroker()
+
+
+def publish_stage(item, stage):
+    """Announce the stage a job item has just entered"""
+    batch_events.publish(item['job_id'], {
+        'type': 'stage',
+        'item_id': str(item['_id']),
+        'main_keyword': item['main_keyword'],
+        'stage': stage
+    })
+
+
+def publish_progress(job_id):
+    """Announce that a job's counters or results changed in MongoDB"""
+    batch_events.publish(job_id, {'type': 'progress'})
+
+
+def _sse(event, data, event_id=None):
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _progress(job_doc):
+    progress = {field: job_doc.get(field) for field in PROGRESS_FIELDS}
+    total = progress['total_keywords'] or 0
+    completed = (progress['processed'] or 0) + (progress['failed'] or 0)
+    progress['progress_percentage'] = round((completed / total) * 100, 2) if total > 0 else 0
+    return progress
+
+
+def get_job_in_flight(job_id):
+    """Return a job's items under a live lease, with their latest stage.
+
+    Items whose lease has expired (their worker died) are not in flight,
+    even though they stay 'processing' until another worker leases them.
+    """
+    items = batch_job_items_collection.find(
+        {'job_id': job_id, 'status': 'processing', 'lease_expires_at': {'$gt': datetime.utcnow()}},
+        {'main_keyword': 1, 'stage': 1}
+    ).sort('row_number', 1)
+    return [
+        {'item_id': str(item['_id']), 'main_keyword': item['main_keyword'], 'stage': item.get('stage', '')}
+        for item in items
+    ]
+
+
+def _in_flight_stages(job_id):
+    """Map each in-flight item's id to its keyword and latest stage.
+
+    Keyed by item rather than keyword: one upload may repeat a keyword.
+    """
+    return {
+        item['item_id']: {'main_keyword': item['main_keyword'], 'stage': item['stage']}
+        for item in get_job_in_flight(job_id)
+    }
+
+
+def stream_job_events(job_id, seen_results=0):
+    """Yield server-sent events for a batch job until it reaches a terminal state.
+
+    ``seen_results`` is the Last-Event-ID of a reconnecting client: the
+    number of results it already has.
+
+    Events:
+      snapshot  the job's progress fields, the results after the first
+                ``results_offset`` and the stages of its in-flight items,
+                keyed by item id (sent once)
+      stage     {item_id, main_keyword, stage} when an item moves to a new stage
+      progress  the progress fields when counters or status change
+      result    one settled item's result, in the order they were recorded
+      done      the final progress fields; the stream then ends
+    """
+    subscriber = batch_events.subscribe(job_id)
+
+    try:
+        # The job is read only once subscribed, so anything published while
+        # it is read arrives as an event instead of being missed
+        job_doc = batch_jobs_collection.find_one({'job_id': job_id}, {'row_errors': 0})
+        if not job_doc:
+            return
+
+        results = job_doc.get('results', [])
+        results_offset = seen_results if 0 < seen_results <= len(results) else 0
+        stages = _in_flight_stages(job_id)
+        progress = _progress(job_doc)
+        known_results = len(results)
+
+        yield _sse('snapshot', {
+            **progress,
+            'job_id': job_id,
+            'results': results[results_offset:],
+            'results_offset': results_offset,
+            'in_flight': stages
+        }, known_results)
+
+        if progress['status'] in TERMINAL_JOB_STATUSES:
+            yield _sse('done', progress)
+            return
+
+        while True:
+            try:
+                event = subscriber.get(timeout=Config.BATCH_EVENTS_POLL_SECONDS)
+            except queue.Empty:
+                event = None
+
+            if event and event['type'] == 'stage':
+                stages[event['item_id']] = {'main_keyword': event['main_keyword'], 'stage': event['stage']}
+                yield _sse('stage', {key: event[key] for key in ('item_id', 'main_keyword', 'stage')})
+                continue
+
+            if event is None:
+                # Quiet period: pick up stages published by other processes
+                changed = False
+                for item_id, in_flight in _in_flight_stages(job_id).items():
+                    if stages.get(item_id) != in_flight:
+                        stages[item_id] = in_flight
+                        changed = True
+                        yield _sse('stage', {'item_id': item_id, **in_flight})
+                if not changed:
+                    yield ": keepalive\n\n"
+
+            # Results are always read back from MongoDB by position, so each
+            # one is sent exactly once whichever path noticed it
+            job_doc = batch_jobs_collection.find_one(
+                {'job_id': job_id},
+                {'results': {'$slice': [known_results, SUBSCRIBER_QUEUE_SIZE]}, 'row_errors': 0}
+            )
+            if not job_doc:
+                return
+
+            latest = _progress(job_doc)
+            if latest != progress:
+                progress = latest
+                yield _sse('progress', progress)
+
+            for result in job_doc.get('results', []):
+                known_results += 1
+                stages.pop(result.get('item_id'), None)
+                yield _sse('result', result, known_results)
+
+            if progress['status'] in TERMINAL_JOB_STATUSES:
+                yield _sse('done', progress)
+                return
+    finally:
+        batch_events.unsubscribe(job_id, subscriber)
@@ -0,0 +1,180 @@
+import codecs
+import csv
+from datetime import datetime
+from utils.db import batch_jobs_collection, batch_job_items_collection
+from services.errors import ServiceError
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+# Items are written in chunks so memory stays flat however long the sheet is
+INSERT_CHUNK_SIZE = 500
+
+# Row errors kept for the upload response and job document; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Status of a job whose rows are still being ingested; workers never lease it
+INGESTING_STATUS = 'ingesting'
+
+
+def iter_upload_rows(file):
+    """Yield each row of an uploaded sheet as a list of cell values.
+
+    .xlsx is streamed with openpyxl in read-only mode and .csv with the csv
+    module, both straight from the upload stream. Legacy .xls has no
+    streaming reader and falls back to pandas.
+    """
+    filename = file.filename.lower()
+
+    if filename.endswith('.csv'):
+        # Decode line by line rather than through TextIOWrapper: uploads
+        # spooled to a SpooledTemporaryFile lack readable() before Python 3.11
+        yield from csv.reader(codecs.iterdecode(file.stream, 'utf-8-sig'))
+
+    elif filename.endswith('.xlsx'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file.stream, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+
+    elif filename.endswith('.xls'):
+        import pandas as pd
+
+        df = pd.read_excel(file.stream, header=None)  # No headers expected
+        for row in df.itertuples(index=False):
+            yield [None if pd.isna(value) else value for value in row]
+
+    else:
+        raise ServiceError('Please upload an Excel or CSV file (.xlsx, .xls or .csv)', 400)
+
+
+def parse_keyword_row(cells):
+    """Return (main_keyword, subsidiary_keywords, error) for one sheet row"""
+    values = ['' if cell is None else str(cell).strip() for cell in cells]
+    main_keyword = values[0] if values else ''
+
+    # Subsidiary keywords are columns 1-5; empty cells are ignored
+    subsidiary_keywords = [value for value in values[1:6] if value]
+
+    if not main_keyword or len(subsidiary_keywords) < 4:
+        return main_keyword, subsidiary_keywords, 'Insufficient keywords (need main + 4-5 subsidiary)'
+
+    return main_keyword, subsidiary_keywords, None
+
+
+def ingest_upload(job_id, file):
+    """Validate an uploaded sheet row by row and persist valid rows as job items.
+
+    Returns a summary dict with the valid and skipped row counts and the
+    first MAX_REPORTED_ERRORS row errors. Raises ServiceError if the file
+    cannot be read or has no valid rows.
+    """
+    valid_rows = 0
+    skipped_rows = 0
+    row_errors = []
+    chunk = []
+
+    def flush():
+        if chunk:
+            batch_job_items_collection.insert_many(chunk, ordered=False)
+            chunk.clear()
+
+    try:
+        for row_number, cells in enumerate(iter_upload_rows(file), start=1):
+            # Blank rows (common at the end of sheets) are not errors
+            if not any(cell not in (None, '') and str(cell).strip() for cell in cells):
+                continue
+
+            main_keyword, subsidiary_keywords, error = parse_keyword_row(cells)
+            if error:
+                skipped_rows += 1
+                if len(row_errors) < MAX_REPORTED_ERRORS:
+                    row_errors.append({
+                        'row': row_number,
+                        'main_keyword': main_keyword,
+                        'error': error
+                    })
+                continue
+
+            valid_rows += 1
+            chunk.append({
+                'job_id': job_id,
+                'row_number': row_number,
+                'main_keyword': main_keyword,
+                'keywords': subsidiary_keywords,
+                'status': 'pending',
+                'created_at': datetime.utcnow()
+            })
+            if len(chunk) >= INSERT_CHUNK_SIZE:
+                flush()
+
+        flush()
+
+    except ServiceError:
+        raise
+    except Exception as e:
+        batch_job_items_collection.delete_many({'job_id': job_id})
+        raise ServiceError(f'Failed to read file: {str(e)}', 400)
+
+    if valid_rows == 0:
+        batch_job_items_collection.delete_many({'job_id': job_id})
+        if skipped_rows == 0:
+            raise ServiceError('Excel file is empty', 400)
+        raise ServiceError(
+            'No valid keyword rows found (need main + 4-5 subsidiary keywords per row)',
+            400,
+            details={'skipped_rows': skipped_rows, 'row_errors': row_errors}
+        )
+
+    return {
+        'valid_rows': valid_rows,
+        'skipped_rows': skipped_rows,
+        'row_errors': row_errors
+    }
+
+
+def create_batch_job(job_id, file, max_workers):
+    """Create a batch job from an upload and queue it for the batch workers.
+
+    The job document is written first, as 'ingesting', so no item ever
+    exists without its job. Workers only lease queued jobs, so it is
+    queued once every row is stored. If ingestion fails, the job and its
+    items are deleted. Returns the ingest summary.
+    """
+    now = datetime.utcnow()
+    batch_jobs_collection.insert_one({
+        'job_id': job_id,
+        'filename': file.filename,
+        'total_keywords': 0,
+        'skipped_rows': 0,
+        'row_errors': [],
+        'status': INGESTING_STATUS,
+        'created_at': now,
+        'updated_at': now,
+        'processed': 0,
+        'failed': 0,
+        'results': [],
+        'max_workers': max_workers
+    })
+
+    try:
+        ingest = ingest_upload(job_id, file)
+        batch_jobs_collection.update_one(
+            {'job_id': job_id},
+            {'$set': {
+                'total_keywords': ingest['valid_rows'],
+                'skipped_rows': ingest['skipped_rows'],
+                'row_errors': ingest['row_errors'],
+                'status': 'queued',
+                'updated_at': datetime.utcnow()
+            }}
+        )
+    except Exception:
+        batch_job_items_collection.delete_many({'job_id': job_id})
+        batch_jobs_collection.delete_one({'job_id': job_id})
+        raise
+
+    return ingest
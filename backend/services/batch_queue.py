@@ -0,0 +1,348 @@
+import atexit
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from config import Config
+from utils.db import batch_jobs_collection, batch_job_items_collection
+from services.pipeline import run_keyword_pipeline
+from services.batch_events import publish_stage, publish_progress
+from services.batch_status import BatchStatusAggregator
+from services.errors import LeaseLostError
+
+# Job items live in batch_job_items and move pending -> processing (leased)
+# -> completed | failed. A lease is an owner plus an expiry; workers renew it
+# at every pipeline stage, and an item whose lease expired (its worker died)
+# is picked up again by any replica. Counters and results are accumulated on
+# the batch_jobs document with $inc/$push; the per-stage job fields, counters
+# and results go through a BatchStatusAggregator that coalesces them into one
+# write per job every BATCH_STATUS_FLUSH_SECONDS.
+# A failed item goes back to pending with a growing retry_at delay until it
+# runs out of attempts; its keyword_id is kept so the retry resumes the
+# pipeline from the last completed stage.
+
+ACTIVE_JOB_STATUSES = ['queued', 'processing']
+OPEN_ITEM_STATUSES = ['pending', 'processing']
+
+
+def _lease_expiry(now):
+    return now + timedelta(seconds=Config.BATCH_LEASE_SECONDS)
+
+
+def lease_next_item(worker_id):
+    """Lease the next runnable item, oldest job first, or return None.
+
+    A job's max_workers is enforced as a soft cap by counting its live leases
+    before leasing; concurrent workers may briefly exceed it by one or two.
+    """
+    now = datetime.utcnow()
+    jobs = batch_jobs_collection.find(
+        {'status': {'$in': ACTIVE_JOB_STATUSES}},
+        {'job_id': 1, 'max_workers': 1, 'status': 1}
+    ).sort('created_at', 1)
+
+    for job in jobs:
+        job_id = job['job_id']
+        live_leases = batch_job_items_collection.count_documents({
+            'job_id': job_id,
+            'status': 'processing',
+            'lease_expires_at': {'$gt': now}
+        })
+        if live_leases >= job.get('max_workers', Config.BATCH_DEFAULT_WORKERS):
+            continue
+
+        item = batch_job_items_collection.find_one_and_update(
+            {
+                'job_id': job_id,
+                '$or': [
+                    {'status': 'pending', 'retry_at': {'$not': {'$gt': now}}},
+                    {'status': 'processing', 'lease_expires_at': {'$lte': now}}
+                ]
+            },
+            {
+                '$set': {
+                    'status': 'processing',
+                    'lease_owner': worker_id,
+                    'lease_expires_at': _lease_expiry(now),
+                    'stage': '⏳ Starting...',
+                    'updated_at': now
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('row_number', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if item:
+            if job['status'] == 'queued':
+                batch_jobs_collection.update_one(
+                    {'job_id': job_id, 'status': 'queued'},
+                    {'$set': {'status': 'processing', 'updated_at': now}}
+                )
+            return item
+
+        if live_leases == 0:
+            # Nothing left to lease or running: make sure the job is closed
+            _finish_job_if_done(job_id)
+
+    return None
+
+
+def renew_lease(item, worker_id, stage):
+    """Extend a lease and publish the item's current stage.
+
+    Returns the update result; matched_count is 0 when the lease was lost,
+    i.e. another worker took the item over after this one's lease expired,
+    and then nothing is published.
+    """
+    now = datetime.utcnow()
+    renewed = batch_job_items_collection.update_one(
+        {'_id': item['_id'], 'lease_owner': worker_id},
+        {'$set': {'stage': stage, 'lease_expires_at': _lease_expiry(now), 'updated_at': now}}
+    )
+    if renewed.matched_count == 0:
+        return renewed
+
+    batch_status.set_fields(item['job_id'], current_keyword=item['main_keyword'], current_stage=stage)
+    publish_stage(item, stage)
+    return renewed
+
+
+def record_keyword_id(item, worker_id, keyword_id):
+    """Remember the keyword document created for an item so retries resume it"""
+    item['keyword_id'] = keyword_id
+    batch_job_items_collection.update_one(
+        {'_id': item['_id'], 'lease_owner': worker_id},
+        {'$set': {'keyword_id': keyword_id, 'updated_at': datetime.utcnow()}}
+    )
+
+
+def requeue_item(item, worker_id, error):
+    """Release a failed item back to pending, to be retried after a delay.
+
+    The delay grows with the number of attempts made so far. Returns False
+    if the lease was lost.
+    """
+    now = datetime.utcnow()
+    delay = Config.BATCH_RETRY_DELAY_SECONDS * item['attempts']
+    stage = f"🔁 Retrying in {delay}s: {error}"
+    requeued = batch_job_items_collection.update_one(
+        {'_id': item['_id'], 'lease_owner': worker_id, 'status': 'processing'},
+        {
+            '$set': {
+                'status': 'pending',
+                'stage': stage,
+                'last_error': error,
+                'retry_at': now + timedelta(seconds=delay),
+                'updated_at': now
+            },
+            '$unset': {'lease_owner': '', 'lease_expires_at': ''}
+        }
+    )
+    if requeued.modified_count == 0:
+        return False
+
+    publish_stage(item, stage)
+    return True
+
+
+def settle_item(item, worker_id, succeeded, result, stage):
+    """Record an item's outcome exactly once.
+
+    Returns False without touching the job if the lease was lost, i.e.
+    another worker has taken the item over after this one stalled.
+    """
+    now = datetime.utcnow()
+    fields = {'keyword_id': result['keyword_id']} if succeeded else {'error': result['error']}
+    settled = batch_job_items_collection.update_one(
+        {'_id': item['_id'], 'lease_owner': worker_id, 'status': 'processing'},
+        {
+            '$set': {
+                'status': 'completed' if succeeded else 'failed',
+                'stage': stage,
+                'completed_at': now,
+                'updated_at': now,
+                **fields
+            },
+            '$unset': {'lease_owner': '', 'lease_expires_at': ''}
+        }
+    )
+    if settled.modified_count == 0:
+        print(f"Lease lost for batch item {item['_id']}, result discarded")
+        return False
+
+    # Progress is published and the job closed once the result is flushed
+    batch_status.set_fields(item['job_id'], current_keyword=item['main_keyword'], current_stage=stage)
+    result = {'item_id': str(item['_id']), **result}
+    batch_status.add_result(item['job_id'], result, 'processed' if succeeded else 'failed')
+    return True
+
+
+def _finish_job_if_done(job_id):
+    """Mark a job complete once none of its items are pending or processing.
+
+    The outcome is decided from the items themselves, not the job counters,
+    which may still be buffered.
+    """
+    if batch_job_items_collection.count_documents(
+        {'job_id': job_id, 'status': {'$in': OPEN_ITEM_STATUSES}}, limit=1
+    ):
+        return
+
+    # Write this process's outstanding results before the job turns terminal
+    batch_status.flush(job_id)
+
+    has_failures = batch_job_items_collection.count_documents(
+        {'job_id': job_id, 'status': 'failed'}, limit=1
+    )
+    completed = batch_job_items_collection.count_documents({'job_id': job_id, 'status': 'completed'})
+    job = batch_jobs_collection.find_one({'job_id': job_id}, {'total_keywords': 1}) or {}
+    succeeded = not has_failures and completed >= job.get('total_keywords', 0)
+
+    finished = batch_jobs_collection.update_one(
+        {'job_id': job_id, 'status': {'$in': ACTIVE_JOB_STATUSES}},
+        {
+            '$set': {
+                'status': 'completed_successfully' if succeeded else 'completed_with_errors',
+                'updated_at': datetime.utcnow()
+            }
+        }
+    )
+    if finished.modified_count:
+        publish_progress(job_id)
+
+
+def _results_flushed(job_id):
+    publish_progress(job_id)
+    _finish_job_if_done(job_id)
+
+
+batch_status = BatchStatusAggregator(
+    batch_jobs_collection,
+    flush_seconds=Config.BATCH_STATUS_FLUSH_SECONDS,
+    on_results_flushed=_results_flushed
+)
+
+
+def format_job(job_doc):
+    """Format a batch_jobs document for API responses"""
+    job_doc['_id'] = str(job_doc['_id'])
+    total = job_doc.get('total_keywords', 0)
+    completed = job_doc.get('processed', 0) + job_doc.get('failed', 0)
+    job_doc['progress_percentage'] = round((completed / total) * 100, 2) if total > 0 else 0
+    for key in ('created_at', 'updated_at'):
+        if isinstance(job_doc.get(key), datetime):
+            job_doc[key] = job_doc[key].isoformat()
+    return job_doc
+
+
+class BatchWorker(threading.Thread):
+    """Daemon thread that leases job items from MongoDB and runs them through the pipeline"""
+
+    def __init__(self, worker_id):
+        super().__init__(name=worker_id, daemon=True)
+        self.worker_id = worker_id
+
+    def run(self):
+        while True:
+            try:
+                item = lease_next_item(self.worker_id)
+            except Exception as e:
+                print(f"Batch worker {self.worker_id} could not lease work: {str(e)}")
+                item = None
+
+            if not item:
+                time.sleep(Config.BATCH_QUEUE_POLL_SECONDS)
+                continue
+
+            try:
+                self.process_item(item)
+            except Exception as e:
+                # Never let one item kill the worker; its lease will expire and be retried
+                print(f"Batch worker {self.worker_id} crashed on {item['main_keyword']}: {str(e)}")
+                traceback.print_exc()
+
+    def process_item(self, item):
+        """Process one job item through the entire pipeline with detailed stage tracking"""
+        main_keyword = item['main_keyword']
+
+        if item['attempts'] > Config.BATCH_MAX_ATTEMPTS:
+            error = item.get('last_error') or f"Abandoned after {Config.BATCH_MAX_ATTEMPTS} interrupted attempts"
+            settle_item(item, self.worker_id, False, {
+                'main_keyword': main_keyword,
+                'status': 'error',
+                'error': error,
+                'completed_at': datetime.utcnow().isoformat()
+            }, f"❌ Error: {error}")
+            return
+
+        def on_stage(stage):
+            # Stop at the next stage instead of running the rest for nothing
+            if renew_lease(item, self.worker_id, stage).matched_count == 0:
+                raise LeaseLostError(f"Lease lost for batch item {item['_id']}")
+
+        try:
+            print(f"Processing: {main_keyword} with keywords: {item['keywords']}")
+
+            keyword_id = run_keyword_pipeline(
+                main_keyword,
+                item['keywords'],
+                on_stage=on_stage,
+                keyword_id=item.get('keyword_id'),
+                on_keyword_created=lambda keyword_id: record_keyword_id(item, self.worker_id, keyword_id)
+            )
+
+            settle_item(item, self.worker_id, True, {
+                'main_keyword': main_keyword,
+                'keyword_id': keyword_id,
+                'status': 'success',
+                'completed_at': datetime.utcnow().isoformat()
+            }, "🎉 Blog completed successfully!")
+
+        except LeaseLostError as e:
+            # The item belongs to another worker now; leave it alone
+            print(f"Batch worker {self.worker_id} stopped {main_keyword}: {str(e)}")
+
+        except Exception as e:
+            print(f"Error processing {main_keyword}: {str(e)}")
+
+            if item['attempts'] < Config.BATCH_MAX_ATTEMPTS:
+                requeue_item(item, self.worker_id, str(e))
+                return
+
+            settle_item(item, self.worker_id, False, {
+                'main_keyword': main_keyword,
+                'status': 'error',
+                'error': str(e),
+                'completed_at': datetime.utcnow().isoformat()
+            }, f"❌ Error: {str(e)}")
+
+
+_workers = []
+_workers_lock = threading.Lock()
+
+
+def start_batch_workers(count=None):
+    """Start this process's batch workers (idempotent).
+
+    Every replica runs its own workers against the shared queue, so jobs
+    interrupted by a restart are resumed by whichever process is up.
+    """
+    with _workers_lock:
+        if _workers:
+            return _workers
+
+        batch_status.start()
+        atexit.register(batch_status.stop)
+
+        count = count or Config.BATCH_WORKER_THREADS
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for n in range(count):
+            worker = BatchWorker(f"{prefix}:{n}")
+            worker.start()
+            _workers.append(worker)
+
+        print(f"Started {count} batch workers")
+        return _workers
@@ -0,0 +1,125 @@
+import threading
+from datetime import datetime
+
+
+class BatchStatusAggregator:
+    """Buffers batch job status updates in memory and writes them in batches.
+
+    Stage changes only overwrite the job's latest ``$set`` fields, counters
+    are summed for ``$inc`` and per-item results are queued for one
+    ``$push`` with ``$each``, so each job costs at most one write per
+    ``flush_seconds`` however many items are in flight. Callers flush a job
+    explicitly before it reaches a terminal state. ``on_results_flushed`` is
+    called with a job_id after results for it were written.
+
+    Job items stay the source of truth for item state; a crash loses at most
+    one interval of job-level counters and results.
+    """
+
+    def __init__(self, collection, flush_seconds=2.0, on_results_flushed=None):
+        self.collection = collection
+        self.flush_seconds = flush_seconds
+        self.on_results_flushed = on_results_flushed
+        self._pending = {}  # job_id -> {"set": {}, "inc": {}, "results": []}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.RLock()  # on_results_flushed may flush again
+        self._thread = None
+        self._stats = {"updates": 0, "writes": 0, "failed_writes": 0}
+
+    def _entry(self, job_id):
+        return self._pending.setdefault(job_id, {"set": {}, "inc": {}, "results": []})
+
+    def set_fields(self, job_id, **fields):
+        """Record the latest value of job fields; later calls overwrite earlier ones"""
+        with self._lock:
+            self._entry(job_id)["set"].update(fields, updated_at=datetime.utcnow())
+            self._stats["updates"] += 1
+
+    def add_result(self, job_id, result, counter):
+        """Queue an item's result and increment the named counter"""
+        with self._lock:
+            entry = self._entry(job_id)
+            entry["results"].append(result)
+            entry["inc"][counter] = entry["inc"].get(counter, 0) + 1
+            entry["set"]["updated_at"] = datetime.utcnow()
+            self._stats["updates"] += 1
+
+    def _merge_back(self, job_id, entry):
+        """Return a failed write's updates to the buffer, behind anything newer"""
+        with self._lock:
+            current = self._entry(job_id)
+            current["set"] = {**entry["set"], **current["set"]}
+            for counter, amount in entry["inc"].items():
+                current["inc"][counter] = current["inc"].get(counter, 0) + amount
+            current["results"] = entry["results"] + current["results"]
+
+    def flush(self, job_id=None):
+        """Write buffered updates for one job, or for every job"""
+        with self._flush_lock:
+            with self._lock:
+                if job_id is None:
+                    pending, self._pending = self._pending, {}
+                else:
+                    entry = self._pending.pop(job_id, None)
+                    pending = {job_id: entry} if entry else {}
+
+            for pending_job_id, entry in pending.items():
+                update = {}
+                if entry["set"]:
+                    update["$set"] = entry["set"]
+                if entry["inc"]:
+                    update["$inc"] = entry["inc"]
+                if entry["results"]:
+                    update["$push"] = {"results": {"$each": entry["results"]}}
+                if not update:
+                    continue
+
+                try:
+                    self.collection.update_one({"job_id": pending_job_id}, update)
+                except Exception as e:
+                    print(f"Batch status flush failed for {pending_job_id}: {str(e)}")
+                    self._merge_back(pending_job_id, entry)
+                    with self._lock:
+                        self._stats["failed_writes"] += 1
+                    continue
+
+                with self._lock:
+                    self._stats["writes"] += 1
+
+                if entry["results"] and self.on_results_flushed:
+                    self.on_results_flushed(pending_job_id)
+
+    def _run(self):
+        while True:
+            self._stop.wait(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Batch status flusher error: {str(e)}")
+            if self._stop.is_set():
+                return
+
+    def start(self):
+        """Start the background flusher thread (idempotent)"""
+        with self._lock:
+            if self._thread:
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="batch-status-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the flusher after one last flush"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread:
+            self._stop.set()
+            thread.join()
+        else:
+            self.flush()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending_jobs"] = len(self._pending)
+        return stats
@@ -0,0 +1,818 @@
+from bson import ObjectId
+from pymongo import ReturnDocument
+from utils.db import (
+    keywords_collection,
+    scraped_data_collection,
+    blogs_collection,
+    images_collection,
+    generation_sessions_collection,
+)
+from models.blog_model import BlogModel
+from utils.llm_generator import BlogGenerator, get_blog_generator, regenerating
+from services.errors import ServiceError
+from config import Config
+from datetime import datetime, timedelta
+import re
+import time
+import copy
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def start_blog_generation(keyword_id):
+    """Create a generation session for a keyword batch and return its id"""
+    keyword_doc = keywords_collection.find_one({"_id": ObjectId(keyword_id)})
+    if not keyword_doc:
+        raise ServiceError("Keyword batch not found", 404)
+
+    scraped_doc = scraped_data_collection.find_one(
+        {"keyword_id": ObjectId(keyword_id)}, {"_id": 1}
+    )
+    if not scraped_doc:
+        raise ServiceError("No scraped data found. Please complete scraping first.", 400)
+
+    session_id = f"{keyword_id}_blog_{int(time.time())}"
+
+    # Store session in database instead of memory. Scraped content is
+    # referenced, not copied; MongoDB's TTL monitor removes the session once
+    # expires_at passes (see utils.db.INDEXES)
+    now = datetime.utcnow()
+    session_data = {
+        "_id": session_id,
+        "keyword_id": keyword_id,
+        "main_keyword": keyword_doc["main_keyword"],
+        "keywords": keyword_doc["keywords"],
+        "scraped_data_id": scraped_doc["_id"],
+        "current_step": 1,
+        "blog_data": {},
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=Config.GENERATION_SESSION_TTL_SECONDS)
+    }
+
+    generation_sessions_collection.insert_one(session_data)
+
+    # Remember the session so an interrupted pipeline can resume its steps
+    keywords_collection.update_one(
+        {"_id": ObjectId(keyword_id)},
+        {"$set": {"generation_session_id": session_id}}
+    )
+
+    return session_id
+
+
+def is_session_live(session_id):
+    """Return True if a generation session exists and has not expired"""
+    return generation_sessions_collection.find_one(
+        {"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}}, {"_id": 1}
+    ) is not None
+
+
+# Steps whose prompts draw on the scraped search results
+SCRAPED_CONTENT_STEPS = {"title_tag", "opening_paragraph", "content_sections"}
+
+# Steps that read the whole blog rather than just their STEP_GRAPH inputs
+FULL_BLOG_STEPS = {"quality_check", "finalize"}
+
+# Fields every loaded session needs, whatever the step
+SESSION_BASE_FIELDS = ["keyword_id", "main_keyword", "keywords", "scraped_data_id",
+                       "current_step", "expires_at"]
+
+
+def _session_projection(step):
+    """Return the projection that loads only what the given step reads"""
+    projection = dict.fromkeys(SESSION_BASE_FIELDS, 1)
+
+    if step in FULL_BLOG_STEPS:
+        projection["blog_data"] = 1
+    else:
+        for field in BlogGenerator.STEP_GRAPH[step]["requires"]:
+            projection[f"blog_data.{field}"] = 1
+
+    if step == "finalize":
+        projection["original_html"] = 1
+        projection["enhanced_html"] = 1
+    if step in SCRAPED_CONTENT_STEPS:
+        projection["scraped_content"] = 1  # legacy sessions only
+
+    return projection
+
+
+def _load_session(session_id, step=None):
+    """Fetch a live generation session and convert it to the in-memory session format.
+
+    With a step, only the fields that step reads are loaded, so blog_data
+    may be partial; without one the whole session is loaded.
+    """
+    if not session_id:
+        raise ServiceError("Session ID is required", 400)
+
+    projection = _session_projection(step) if step else None
+    session_doc = generation_sessions_collection.find_one({"_id": session_id}, projection)
+
+    if not session_doc:
+        raise ServiceError("No active generation session found", 400)
+
+    # The TTL monitor runs about once a minute, so a just-expired session may
+    # still be readable; treat it as gone and let the monitor delete it
+    if session_doc.get("expires_at") and session_doc["expires_at"] < datetime.utcnow():
+        raise ServiceError("Generation session expired", 400)
+
+    # Convert database document to session format
+    session = {
+        "session_id": session_id,
+        "keyword_id": session_doc["keyword_id"],
+        "main_keyword": session_doc["main_keyword"],
+        "keywords": session_doc["keywords"],
+        "scraped_data_id": session_doc.get("scraped_data_id"),
+        "current_step": session_doc["current_step"],
+        "blog_data": session_doc.get("blog_data", {})
+    }
+
+    # Sessions created before scraped content was referenced carry a copy
+    if "scraped_content" in session_doc:
+        session["scraped_content"] = session_doc["scraped_content"]
+
+    # HTML versions produced by the quality check
+    for key in ("original_html", "enhanced_html"):
+        if key in session_doc:
+            session[key] = session_doc[key]
+
+    return session
+
+
+def _scraped_content(session):
+    """Return the scraped content a session references, loading it on first use"""
+    if "scraped_content" not in session:
+        scraped_doc = scraped_data_collection.find_one(
+            {"_id": session["scraped_data_id"]}, {"content": 1}
+        )
+        if not scraped_doc:
+            raise ServiceError("Scraped data for this session no longer exists", 400)
+        session["scraped_content"] = scraped_doc["content"]
+
+    return session["scraped_content"]
+
+
+# Step handlers take (generator, session) and return
+# (result, blog_data updates, session-level updates). They never mutate the
+# session themselves, so independent steps can run on a snapshot concurrently.
+
+def _title_tag_step(generator, session):
+    title = generator.generate_title_tag(
+        session["main_keyword"], session["keywords"], _scraped_content(session)
+    )
+    return {"title": title}, {"title": title}, {}
+
+
+def _h1_heading_step(generator, session):
+    h1 = generator.generate_h1_heading(
+        session["blog_data"]["title"], session["main_keyword"]
+    )
+    return {"h1": h1}, {"h1": h1}, {}
+
+
+def _opening_paragraph_step(generator, session):
+    opening = generator.generate_opening_paragraph(
+        session["blog_data"]["title"],
+        session["blog_data"]["h1"],
+        session["main_keyword"],
+        _scraped_content(session),
+    )
+    return {"opening_paragraph": opening}, {"opening_paragraph": opening}, {}
+
+
+def _subheadings_step(generator, session):
+    subheadings = generator.generate_subheadings(
+        session["blog_data"]["title"],
+        session["main_keyword"],
+        session["keywords"],
+    )
+    return {"subheadings": subheadings}, {"subheadings": subheadings}, {}
+
+
+def _content_sections_step(generator, session):
+    content_sections = generator.generate_content_sections(
+        session["blog_data"]["subheadings"],
+        _scraped_content(session),
+        session["main_keyword"],
+        session.get("keywords", []),
+    )
+    return (
+        {"content_sections": content_sections},
+        {"content_sections": content_sections},
+        {},
+    )
+
+
+def _cta_step(generator, session):
+    cta = generator.generate_cta(
+        session["main_keyword"], session["blog_data"]["title"]
+    )
+    return {"cta": cta}, {"cta": cta}, {}
+
+
+def _conclusion_step(generator, session):
+    conclusion = generator.generate_conclusion(
+        session["blog_data"]["title"],
+        session["main_keyword"],
+        session["blog_data"]["subheadings"],
+    )
+    return {"conclusion": conclusion}, {"conclusion": conclusion}, {}
+
+
+def _quality_check_step(generator, session):
+    keywords = session.get("keywords", [])
+
+    quality_result = generator.generate_quality_check_step(
+        session["blog_data"], session["main_keyword"], keywords
+    )
+
+    # Store HTML versions in session for database storage
+    session_updates = {
+        "original_html": quality_result["original_html"],
+        "enhanced_html": quality_result["enhanced_html"],
+    }
+
+    blog_updates = {"quality_checked": True}
+    if quality_result["enhancement_done"]:
+        blog_updates = dict(quality_result["enhanced_blog_data"])
+        blog_updates["quality_enhanced"] = True
+        blog_updates["word_count"] = quality_result["final_word_count"]
+        blog_updates["quality_checked"] = True
+
+    result = {
+        "quality_report": quality_result["original_report"],
+        "enhanced_report": quality_result["enhanced_report"],
+        "enhancement_done": quality_result["enhancement_done"],
+        "final_word_count": quality_result["final_word_count"],
+        "topic_complexity": quality_result["original_report"].get(
+            "topic_complexity", "unknown"
+        ),
+        "target_range": f"{quality_result['enhanced_report'].get('min_words', 0)}-{quality_result['enhanced_report'].get('target_words', 0)} words",
+    }
+
+    return result, blog_updates, session_updates
+
+
+def _finalize_step(generator, session):
+    keyword_id = session["keyword_id"]
+
+    html_content = session.get(
+        "enhanced_html"
+    ) or generator.generate_simple_html(session["blog_data"])
+    original_html = session.get("original_html")
+
+    blog_doc = BlogModel.create_blog_document(
+        keyword_id, session["blog_data"], html_content, original_html
+    )
+
+    # One blog per keyword batch (unique keyword_id index): regenerating
+    # replaces the previous blog in place and keeps its _id
+    saved = blogs_collection.find_one_and_replace(
+        {"keyword_id": ObjectId(keyword_id)},
+        blog_doc,
+        projection={"_id": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+
+    keywords_collection.update_one(
+        {"_id": ObjectId(keyword_id)},
+        {
+            "$set": {
+                "blog_id": saved["_id"],
+                "status": "blog_generated",
+                "final_word_count": session["blog_data"].get("word_count", 0),
+            }
+        },
+    )
+
+    # Clean up session from database after finalization
+    generation_sessions_collection.delete_one({"_id": session["session_id"]})
+
+    blog_doc["_id"] = saved["_id"]
+    formatted_blog = BlogModel.format_blog_response(blog_doc)
+
+    result = {
+        "message": "Blog generated successfully",
+        "blog": formatted_blog,
+        "has_original_version": bool(original_html),
+    }
+
+    return result, {}, {}
+
+
+STEP_HANDLERS = {
+    "title_tag": _title_tag_step,
+    "h1_heading": _h1_heading_step,
+    "opening_paragraph": _opening_paragraph_step,
+    "subheadings": _subheadings_step,
+    "content_sections": _content_sections_step,
+    "cta": _cta_step,
+    "conclusion": _conclusion_step,
+    "quality_check": _quality_check_step,
+    "finalize": _finalize_step,
+}
+
+
+def _apply_step(session, step, blog_updates, session_updates):
+    """Merge a finished step into the session and persist it (finalize deletes the session).
+
+    Only the fields the step produced are written, as dotted blog_data.<field>
+    sets, so each step costs the size of its own output rather than the
+    whole blog so far.
+    """
+    session["blog_data"].update(blog_updates)
+    session.update(session_updates)
+    step_number = BlogGenerator.STEP_NUMBERS[step] + 1
+    session["current_step"] = max(session["current_step"], step_number)
+
+    # Update session in database after each step (except finalize which deletes it)
+    if step != "finalize":
+        update_data = {f"blog_data.{field}": value for field, value in blog_updates.items()}
+        # HTML versions produced by the quality check
+        update_data.update(session_updates)
+        update_data["updated_at"] = datetime.utcnow()
+
+        generation_sessions_collection.update_one(
+            {"_id": session["session_id"]},
+            {"$set": update_data, "$max": {"current_step": step_number}}
+        )
+
+
+def run_blog_step(keyword_id, session_id, step, regenerate=False):
+    """Run one blog generation step against a stored session.
+
+    With ``regenerate`` the step's prompts skip the LLM response cache, so
+    a step re-run after an unwanted result gets new text. Returns a
+    (result, current_step) tuple.
+    """
+    if step not in STEP_HANDLERS:
+        raise ServiceError("Invalid step", 400)
+
+    session = _load_session(session_id, step)
+
+    missing = BlogGenerator.missing_step_inputs(step, session["blog_data"])
+    if missing:
+        raise ServiceError(f"{', '.join(missing)} must be generated first", 400)
+
+    generator = get_blog_generator()
+    with regenerating(regenerate):
+        result, blog_updates, session_updates = STEP_HANDLERS[step](generator, session)
+    _apply_step(session, step, blog_updates, session_updates)
+
+    return result, session["current_step"]
+
+
+def run_all_blog_steps(keyword_id, session_id, on_step=None):
+    """Run every remaining blog step, starting each one as soon as its inputs exist.
+
+    Steps whose inputs are ready run concurrently, so the wall-clock time is
+    the critical path of BlogGenerator.STEP_GRAPH rather than the sum of all
+    steps. ``on_step`` is called with the step id as each step starts.
+    Returns a ({step: result}, current_step) tuple.
+    """
+    session = _load_session(session_id)
+    generator = get_blog_generator()
+
+    pending = [
+        step for step in BlogGenerator.STEP_GRAPH
+        if not BlogGenerator.is_step_complete(step, session["blog_data"])
+    ]
+    results = {}
+
+    # Load scraped content once so step snapshots share it
+    if any(step in SCRAPED_CONTENT_STEPS for step in pending):
+        _scraped_content(session)
+
+    with ThreadPoolExecutor(max_workers=len(STEP_HANDLERS)) as executor:
+        running = {}
+
+        while pending or running:
+            for step in BlogGenerator.ready_steps(pending, session["blog_data"]):
+                pending.remove(step)
+                if on_step:
+                    on_step(step)
+
+                # Each step works on its own snapshot of the session
+                snapshot = dict(session, blog_data=copy.deepcopy(session["blog_data"]))
+                running[executor.submit(STEP_HANDLERS[step], generator, snapshot)] = step
+
+            if not running:
+                raise ServiceError(
+                    f"Blog steps cannot run, missing inputs: {', '.join(pending)}", 400
+                )
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                result, blog_updates, session_updates = future.result()
+                _apply_step(session, step, blog_updates, session_updates)
+                results[step] = result
+
+    return results, session["current_step"]
+
+
+def integrate_images(keyword_id, selected_image_ids=None):
+    """Integrate the selected (or first four) images into a generated blog"""
+    # Get the blog document
+    blog_doc = blogs_collection.find_one({"keyword_id": ObjectId(keyword_id)})
+    if not blog_doc:
+        raise ServiceError("Blog not found", 404)
+
+    # Get the images document from MongoDB
+    images_doc = images_collection.find_one({"keyword_id": ObjectId(keyword_id)})
+    if not images_doc:
+        raise ServiceError("Images not found", 404)
+
+    # Debug: Print the structure
+    print(f"Images document structure: {images_doc.keys()}")
+    if "images" in images_doc:
+        print(f"Images field type: {type(images_doc['images'])}")
+        if isinstance(images_doc["images"], dict):
+            print(f"Images keys: {images_doc['images'].keys()}")
+
+    # Extract all images - handle MongoDB structure
+    all_images = []
+
+    # The structure appears to be: images_doc['images']['images']['main'], etc.
+    if "images" in images_doc:
+        images_data = images_doc["images"]
+
+        # Check if it's nested
+        if isinstance(images_data, dict) and "images" in images_data:
+            # It's nested: images.images.{keyword}
+            for keyword, keyword_images in images_data["images"].items():
+                if isinstance(keyword_images, list):
+                    for idx, img in enumerate(keyword_images):
+                        if isinstance(img, dict):
+                            # Generate better alt text based on context
+                            keyword_clean = keyword.replace("_", " ").replace(
+                                "-", " "
+                            )
+
+                            # Check multiple fields for alt text
+                            alt_text = (
+                                img.get("alt_text", "")
+                                or img.get("title", "")
+                                or img.get("alt", "")
+                                or img.get("description", "")
+                            )
+
+                            # If still no alt text, generate contextual one
+                            if not alt_text:
+                                # Generate generic contextual alt text
+                                if keyword == "main":
+                                    alt_text = f"{keyword_clean} illustration"
+                                else:
+                                    alt_text = f"{keyword_clean.title()} concept image"
+
+                            # Clean up the alt text
+                            alt_text = alt_text.strip()
+                            if len(alt_text) > 100:
+                                alt_text = alt_text[:97] + "..."
+
+                            processed_img = {
+                                "url": img.get("url", ""),
+                                "alt_text": alt_text,
+                                "title": img.get("title", "") or alt_text,
+                                "source": img.get("source", "Web"),
+                                "keyword_context": keyword,
+                                "unique_id": f"{img.get('url', '')}_{keyword}_{idx}",
+                            }
+                            if processed_img["url"]:
+                                all_images.append(processed_img)
+                                print(
+                                    f"Added image from {keyword}: {processed_img['url'][:50]}..."
+                                )
+
+    print(f"Total images extracted: {len(all_images)}")
+
+    # Select images
+    if selected_image_ids and len(selected_image_ids) > 0:
+        selected_images = [
+            img for img in all_images if img["unique_id"] in selected_image_ids
+        ]
+    else:
+        # Auto-select first 4 images
+        selected_images = all_images[:4]
+
+    print(f"Selected {len(selected_images)} images for integration")
+
+    # Get the current body (already image-integrated on a re-run)
+    html_content = BlogModel.body_html(blog_doc)
+
+    if not html_content:
+        raise ServiceError("No HTML content found in blog", 400)
+
+    # Integrate images
+    html_with_images = integrate_images_into_html_v2(html_content, selected_images)
+
+    # Save the updated HTML
+    update_result = blogs_collection.update_one(
+        {"_id": blog_doc["_id"]},
+        {
+            "$set": {
+                # The image-integrated body replaces the canonical copy
+                "html_content": BlogModel.pack_html(html_with_images),
+                "integrated_images": selected_images,
+                "image_integration_complete": True,
+                "status": "images_integrated",
+                "updated_at": datetime.utcnow(),
+            },
+            "$unset": {"html_with_images": "", "enhanced_html": ""},
+        },
+    )
+
+    print(f"Blog updated: {update_result.modified_count} document(s) modified")
+
+    # Update keyword status
+    keywords_collection.update_one(
+        {"_id": ObjectId(keyword_id)}, {"$set": {"status": "images_integrated"}}
+    )
+
+    return {
+        "message": "Images integrated successfully",
+        "html_preview": html_with_images,
+        "images_used": len(selected_images),
+        "image_urls": [img["url"] for img in selected_images],
+    }
+
+
+def integrate_images_into_html_v2(html_content, selected_images):
+    """Image integration with proper alt text and captions for ALL images"""
+    if not selected_images:
+        print("No images to integrate")
+        # Remove image placeholders if no images available
+        html_content = re.sub(r'\[Featured Image\]', 'Featured image not available', html_content)
+        html_content = re.sub(r'\[Content Image \d+\]', 'Content image not available', html_content)
+        html_content = re.sub(r'\[Image \d+\]', 'Image not available', html_content)
+        return html_content
+
+    html = html_content
+    images_replaced = set()
+
+    # Image 1: Featured Image
+    if len(selected_images) > 0 and "featured" not in images_replaced:
+        img = selected_images[0]
+        
+        # Validate image URL
+        if img.get('url') and img['url'].strip():
+            alt_text = (
+                img.get("alt_text", "")
+                or img.get("title", "")
+                or f"{img.get('keyword_context', 'featured')} image"
+            )
+
+            featured_html = f"""<figure class="featured-image">
+<img src="{img['url']}" alt="{alt_text}" loading="lazy" onerror="this.style.display='none'">
+<figcaption>{alt_text}</figcaption>
+</figure>"""
+        else:
+            # If no valid URL, show placeholder
+            featured_html = """<figure class="featured-image">
+<div style="background-color: #f0f0f0; padding: 100px; text-align: center; color: #999;">Featured Image</div>
+</figure>"""
+
+        patterns_to_try = [
+            (r"\[Featured Image\]", featured_html),
+            (
+                r'<figure class="featured-image">\s*\[Featured Image\]\s*</figure>',
+                featured_html,
+            ),
+            (r"<div[^>]*>\s*\[Featured Image[^\]]*\]\s*</div>", featured_html),
+        ]
+
+        for pattern, replacement in patterns_to_try:
+            new_html = re.sub(
+                pattern, replacement, html, count=1, flags=re.IGNORECASE | re.DOTALL
+            )
+            if new_html != html:
+                html = new_html
+                images_replaced.add("featured")
+                print(f"Replaced featured image with alt: {alt_text if img.get('url') else 'placeholder'}")
+                break
+
+    # Similar validation for other images...
+    # Rest of the function continues with similar URL validation
+
+    # Images 2-3: Content Images
+    content_image_count = 0
+    for i in range(1, min(len(selected_images), 3)):
+        if f"content_{i}" in images_replaced:
+            continue
+
+        img = selected_images[i]
+        alt_text = (
+            img.get("alt_text", "")
+            or img.get("title", "")
+            or f"{img.get('keyword_context', 'welding')} technology"
+        )
+
+        content_html = f"""<figure class="content-image">
+<img src="{img['url']}" alt="{alt_text}" loading="lazy">
+<figcaption>{alt_text}</figcaption>
+</figure>"""
+
+        patterns_to_try = [
+            (rf"\[Content Image {content_image_count + 1}\]", content_html),
+            (
+                rf'<figure class="content-image">\s*\[Content Image {content_image_count + 1}\]\s*</figure>',
+                content_html,
+            ),
+            (rf"\[Image {content_image_count + 1}\]", content_html),
+        ]
+
+        replaced = False
+        for pattern, replacement in patterns_to_try:
+            new_html = re.sub(
+                pattern, replacement, html, count=1, flags=re.IGNORECASE | re.DOTALL
+            )
+            if new_html != html:
+                html = new_html
+                content_image_count += 1
+                images_replaced.add(f"content_{i}")
+                print(
+                    f"Replaced content image {content_image_count} with alt: {alt_text}"
+                )
+                replaced = True
+                break
+
+        if not replaced and f"content_{i}" not in images_replaced:
+            h2_positions = list(re.finditer(r"</h2>", html))
+            if len(h2_positions) >= (content_image_count + 1) * 2:
+                insert_pos = h2_positions[(content_image_count + 1) * 2 - 1].end()
+                next_section = re.search(r"<h2|<section|</article", html[insert_pos:])
+                if next_section:
+                    insert_pos += next_section.start()
+                    html = (
+                        html[:insert_pos]
+                        + "\n"
+                        + content_html
+                        + "\n"
+                        + html[insert_pos:]
+                    )
+                    content_image_count += 1
+                    images_replaced.add(f"content_{i}")
+                    print(
+                        f"Inserted content image {content_image_count} with alt: {alt_text}"
+                    )
+
+    # Image 4: Before CTA - WITH CAPTION
+    if len(selected_images) > 3 and "cta" not in images_replaced:
+        img = selected_images[3]
+        alt_text = (
+            img.get("alt_text", "")
+            or img.get("title", "")
+            or "Smart welding technology in action"
+        )
+
+        # CTA image WITH caption
+        cta_html = f"""<figure class="cta-image">
+<img src="{img['url']}" alt="{alt_text}" loading="lazy">
+<figcaption>{alt_text}</figcaption>
+</figure>"""
+
+        cta_pattern = r'<section class="cta-section">'
+        if re.search(cta_pattern, html):
+            html = re.sub(
+                cta_pattern,
+                cta_html + "\n" + r'<section class="cta-section">',
+                html,
+                count=1,
+            )
+            images_replaced.add("cta")
+            print(f"Inserted CTA image with alt: {alt_text}")
+
+    # Clean up any duplicate figures
+    html = clean_duplicate_images(html)
+
+    return html
+
+
+def clean_duplicate_images(html):
+    """Remove duplicate consecutive image figures"""
+    # Pattern to find consecutive identical figures
+    pattern = r"(<figure[^>]*>.*?</figure>)\s*\1"
+
+    # Keep removing duplicates until none are found
+    while re.search(pattern, html, re.DOTALL):
+        html = re.sub(pattern, r"\1", html, flags=re.DOTALL)
+
+    return html
+
+
+def generate_metadata(keyword_id):
+    """Generate SEO metadata and the publish-ready HTML for a generated blog"""
+    # Get the blog document
+    blog_doc = blogs_collection.find_one({"keyword_id": ObjectId(keyword_id)})
+    if not blog_doc:
+        raise ServiceError("Blog not found", 404)
+
+    # Get keyword document for context
+    keyword_doc = keywords_collection.find_one({"_id": ObjectId(keyword_id)})
+
+    generator = get_blog_generator()
+
+    # Generate metadata
+    metadata = generator.generate_blog_metadata(
+        blog_doc, keyword_doc["main_keyword"], keyword_doc["keywords"]
+    )
+
+    # Get the final HTML (with images if available)
+    final_html = BlogModel.body_html(blog_doc)
+
+    # Create the final publish-ready HTML
+    publish_ready_html = generator.create_publish_ready_html(
+        final_html, metadata, BlogModel.decode_html_fields(dict(blog_doc))
+    )
+
+    # Clean the metadata values
+    for key in ["post_title", "meta_title", "meta_description", "post_description"]:
+        if key in metadata:
+            # Remove markdown symbols
+            metadata[key] = re.sub(r"^#+\s*", "", metadata[key])
+            metadata[key] = metadata[key].strip()
+
+    # Update blog document with ALL fields
+    update_data = {
+        # Metadata fields
+        "post_title": metadata["post_title"],
+        "meta_title": metadata["meta_title"],
+        "meta_description": metadata["meta_description"],
+        "post_description": metadata["post_description"],
+        "featured_image": metadata["featured_image"],
+        "slug": metadata["slug"],
+        "meta_keywords": metadata["meta_keywords"],
+        "og_title": metadata["og_title"],
+        "og_description": metadata["og_description"],
+        "canonical_url": metadata["canonical_url"],
+        "author": metadata["author"],
+        "publisher": metadata["publisher"],
+        # HTML versions
+        "publish_ready_html": BlogModel.pack_html(publish_ready_html),
+        # Status fields
+        "metadata_complete": True,
+        "status": "ready_to_publish",
+        "updated_at": datetime.utcnow(),
+    }
+
+    # Render the txt/json downloads once so download endpoints only serve bytes
+    update_data.update(
+        BlogModel.build_renditions({**blog_doc, **update_data}, publish_ready_html)
+    )
+
+    # Perform the update
+    result = blogs_collection.update_one(
+        {"_id": blog_doc["_id"]},
+        {"$set": update_data, "$unset": {"final_html": ""}},
+    )
+
+    if result.modified_count == 0:
+        print(f"Warning: No documents were updated for blog {blog_doc['_id']}")
+
+    # Also update keyword document status
+    keywords_collection.update_one(
+        {"_id": ObjectId(keyword_id)},
+        {
+            "$set": {
+                "status": "ready_to_publish",
+                "final_blog_id": str(blog_doc["_id"]),
+            }
+        },
+    )
+
+    return {
+        "message": "Metadata generated successfully",
+        "metadata": metadata,
+        "final_html": publish_ready_html,
+        "blog_id": str(blog_doc["_id"]),
+    }
+
+
+def generation_session_stats():
+    """Return live session count and storage size for the generation_sessions collection"""
+    now = datetime.utcnow()
+    stats = {"live_sessions": 0, "total_bytes": 0, "avg_bytes": 0}
+
+    pipeline = [
+        {"$match": {"expires_at": {"$gt": now}}},
+        {
+            "$group": {
+                "_id": None,
+                "live_sessions": {"$sum": 1},
+                "total_bytes": {"$sum": {"$bsonSize": "$$ROOT"}},
+            }
+        },
+    ]
+    for row in generation_sessions_collection.aggregate(pipeline):
+        stats["live_sessions"] = row["live_sessions"]
+        stats["total_bytes"] = row["total_bytes"]
+        stats["avg_bytes"] = row["total_bytes"] // row["live_sessions"]
+
+    # Expired documents the TTL monitor has not removed yet
+    stats["awaiting_expiry"] = generation_sessions_collection.count_documents(
+        {"expires_at": {"$lte": now}}
+    )
+    stats["ttl_seconds"] = Config.GENERATION_SESSION_TTL_SECONDS
+
+    return stats
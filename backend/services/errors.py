@@ -0,0 +1,12 @@
+class ServiceError(Exception):
+    """Error raised by the service layer, carrying the HTTP status a route should return"""
+
+    def __init__(self, message, status_code=400, details=None):
+        super().__init__(message)
+        self.status_code = status_code
+        # Extra fields a route may add to the error response
+        self.details = details or {}
+
+
+class LeaseLostError(Exception):
+    """Raised in a batch worker whose item lease was taken over by another worker"""
@@ -0,0 +1,61 @@
+from bson import ObjectId
+from utils.db import keywords_collection, images_collection
+from models.image_model import ImageModel
+from utils.image_search import ImageSearcher
+from services.errors import ServiceError
+
+
+def search_images_for_batch(keyword_id):
+    """Search images for a keyword batch and return the formatted image document"""
+    # Get keyword batch
+    keyword_doc = keywords_collection.find_one({"_id": ObjectId(keyword_id)})
+
+    if not keyword_doc:
+        raise ServiceError("Keyword batch not found", 404)
+
+    # Check if images already searched
+    existing_images = images_collection.find_one({"keyword_id": ObjectId(keyword_id)})
+    if existing_images:
+        raise ServiceError("Images already searched for this keyword batch", 400)
+
+    try:
+        # Update status
+        keywords_collection.update_one(
+            {"_id": ObjectId(keyword_id)},
+            {"$set": {"status": "searching_images"}}
+        )
+
+        # Initialize image searcher
+        searcher = ImageSearcher()
+
+        # Search for images
+        image_results = searcher.search_images_for_keywords(
+            keyword_doc['main_keyword'],
+            keyword_doc['keywords']
+        )
+
+        # Save image data
+        image_doc = ImageModel.create_image_batch(keyword_id, image_results)
+        result = images_collection.insert_one(image_doc)
+
+        # Update keyword document
+        keywords_collection.update_one(
+            {"_id": ObjectId(keyword_id)},
+            {
+                "$set": {
+                    "status": "images_found",
+                    "images_id": result.inserted_id
+                }
+            }
+        )
+
+        image_doc['_id'] = result.inserted_id
+        return ImageModel.format_image_response(image_doc)
+
+    except Exception:
+        # Update status to failed
+        keywords_collection.update_one(
+            {"_id": ObjectId(keyword_id)},
+            {"$set": {"status": "image_search_failed"}}
+        )
+        raise
@@ -0,0 +1,22 @@
+from utils.db import keywords_collection
+from models.keyword_model import KeywordModel
+from services.errors import ServiceError
+
+
+def create_keyword_batch(main_keyword, keywords):
+    """Validate and store a keyword batch, returning the formatted document"""
+    # Validation
+    if not main_keyword:
+        raise ServiceError("Main keyword is required", 400)
+
+    if not keywords or len(keywords) < 4 or len(keywords) > 5:
+        raise ServiceError("Please provide 4-5 keywords", 400)
+
+    # Create keyword batch
+    keyword_doc = KeywordModel.create_keyword_batch(main_keyword, keywords)
+
+    # Save to MongoDB
+    result = keywords_collection.insert_one(keyword_doc)
+    keyword_doc['_id'] = result.inserted_id
+
+    return KeywordModel.format_keyword_response(keyword_doc)
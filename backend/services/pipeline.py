@@ -0,0 +1,147 @@
+from bson import ObjectId
+from utils.db import keywords_collection
+from services.keyword_service import create_keyword_batch
+from services.scraping_service import scrape_keyword_batch
+from services.image_service import search_images_for_batch
+from services import blog_service
+from utils.concurrency import stage_limit
+from services.errors import LeaseLostError
+
+# Blog generation steps with the stage shown to operators
+BLOG_STEPS = [
+    ("title_tag", "📝 Creating SEO title..."),
+    ("h1_heading", "📋 Generating H1 heading..."),
+    ("opening_paragraph", "🎯 Writing opening paragraph..."),
+    ("subheadings", "📑 Creating subheadings..."),
+    ("content_sections", "📄 Writing content sections..."),
+    ("cta", "📢 Crafting call-to-action..."),
+    ("conclusion", "🏁 Writing conclusion..."),
+    ("quality_check", "🔍 Quality check & enhancement..."),
+    ("finalize", "✅ Finalizing blog...")
+]
+
+
+# Keyword statuses that mark a finished pipeline stage, in pipeline order
+CHECKPOINTS = ["scraped", "images_found", "blog_generated", "images_integrated", "ready_to_publish"]
+
+# In-progress and failure statuses, mapped to the last checkpoint they imply
+STATUS_CHECKPOINTS = {
+    "created": None,
+    "scraping": None,
+    "scraping_failed": None,
+    "searching_images": "scraped",
+    "image_search_failed": "scraped",
+}
+
+
+def completed_stages(keyword_doc):
+    """Return the checkpoints a keyword document has already passed"""
+    status = keyword_doc.get("status", "created")
+    reached = status if status in CHECKPOINTS else STATUS_CHECKPOINTS.get(status)
+    if reached is None:
+        return set()
+    return set(CHECKPOINTS[:CHECKPOINTS.index(reached) + 1])
+
+
+def run_keyword_pipeline(main_keyword, subsidiary_keywords, on_stage=None,
+                         keyword_id=None, on_keyword_created=None):
+    """Run a keyword set through every stage in-process and return its keyword_id.
+
+    Calls the same service functions the HTTP routes wrap, so no stage goes
+    through our own web server. ``on_stage`` is called with a short progress
+    message before each stage starts; a LeaseLostError it raises stops the
+    run there.
+
+    Each stage is checkpointed by the keyword document's status. Passing the
+    keyword_id of an earlier, interrupted run resumes from the first
+    incomplete stage (and from the unfinished blog steps of a still-live
+    generation session) instead of starting over. ``on_keyword_created`` is
+    called with the new keyword_id so callers can record it for retries.
+    """
+    def report(stage):
+        if on_stage:
+            on_stage(stage)
+
+    keyword_doc = None
+    if keyword_id:
+        keyword_doc = keywords_collection.find_one({"_id": ObjectId(keyword_id)})
+
+    if keyword_doc:
+        done = completed_stages(keyword_doc)
+        if done:
+            last_checkpoint = next(stage for stage in reversed(CHECKPOINTS) if stage in done)
+            report(f"⏩ Resuming after {last_checkpoint.replace('_', ' ')}...")
+    else:
+        # Step 1: Create keywords
+        report("🔧 Creating keyword batch...")
+        try:
+            keyword_id = create_keyword_batch(main_keyword, subsidiary_keywords)['_id']
+        except Exception as e:
+            raise Exception(f"Failed to create keywords: {str(e)}")
+        if on_keyword_created:
+            on_keyword_created(keyword_id)
+        done = set()
+
+    # Step 2: Scrape content
+    if "scraped" not in done:
+        report("🔍 Scraping industry content...")
+        try:
+            with stage_limit('scraping'):
+                scrape_keyword_batch(keyword_id)
+        except Exception as e:
+            raise Exception(f"Failed to scrape content: {str(e)}")
+
+    # Step 3: Search images
+    if "images_found" not in done:
+        report("🖼️ Finding relevant images...")
+        try:
+            with stage_limit('scraping'):
+                search_images_for_batch(keyword_id)
+        except Exception as e:
+            # Continue without images
+            print(f"Warning: Image search failed for {main_keyword}: {str(e)}")
+
+    # Step 4: Generate blog
+    if "blog_generated" not in done:
+        session_id = keyword_doc.get("generation_session_id") if keyword_doc else None
+        if session_id and blog_service.is_session_live(session_id):
+            report("✍️ Resuming blog generation...")
+        else:
+            report("✍️ Generating blog content...")
+            try:
+                session_id = blog_service.start_blog_generation(keyword_id)
+            except Exception as e:
+                raise Exception(f"Failed to start blog generation: {str(e)}")
+
+        # Independent steps run concurrently; report each one as it starts.
+        # Steps already saved on a resumed session are skipped.
+        step_descriptions = dict(BLOG_STEPS)
+        try:
+            blog_service.run_all_blog_steps(
+                keyword_id,
+                session_id,
+                on_step=lambda step_id: report(step_descriptions[step_id])
+            )
+        except LeaseLostError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed at blog generation: {str(e)}")
+
+    # Step 5: Integrate images (auto-select first 4)
+    if "images_integrated" not in done:
+        report("🎨 Integrating images into blog...")
+        try:
+            blog_service.integrate_images(keyword_id, [])
+        except Exception as e:
+            # Continue without image integration
+            print(f"Warning: Image integration failed for {main_keyword}: {str(e)}")
+
+    # Step 6: Generate metadata
+    if "ready_to_publish" not in done:
+        report("🏷️ Generating SEO metadata...")
+        try:
+            blog_service.generate_metadata(keyword_id)
+        except Exception as e:
+            raise Exception(f"Failed to generate metadata: {str(e)}")
+
+    return keyword_id
@@ -0,0 +1,68 @@
+from bson import ObjectId
+from pymongo import ReturnDocument
+from utils.db import keywords_collection, scraped_data_collection
+from models.scraped_data_model import ScrapedDataModel
+from utils.scraper import WeldingScraper
+from services.errors import ServiceError
+
+
+def scrape_keyword_batch(keyword_id):
+    """Scrape content for a keyword batch and return the formatted scraped document"""
+    # Get keyword batch
+    keyword_doc = keywords_collection.find_one({"_id": ObjectId(keyword_id)})
+
+    if not keyword_doc:
+        raise ServiceError("Keyword batch not found", 404)
+
+    # Check if already scraped
+    if keyword_doc.get('status') == 'scraped':
+        raise ServiceError("Content already scraped for this keyword batch", 400)
+
+    try:
+        # Update status to scraping
+        keywords_collection.update_one(
+            {"_id": ObjectId(keyword_id)},
+            {"$set": {"status": "scraping"}}
+        )
+
+        # Initialize scraper
+        scraper = WeldingScraper()
+
+        # Perform scraping
+        scraped_results = scraper.scrape_for_keywords(
+            keyword_doc['main_keyword'],
+            keyword_doc['keywords']
+        )
+
+        # Save scraped data; a retry after an interrupted scrape replaces the
+        # earlier document instead of tripping the unique keyword_id index
+        scraped_doc = ScrapedDataModel.create_scraped_data(keyword_id, scraped_results)
+        saved = scraped_data_collection.find_one_and_replace(
+            {"keyword_id": ObjectId(keyword_id)},
+            scraped_doc,
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+        # Update keyword document
+        keywords_collection.update_one(
+            {"_id": ObjectId(keyword_id)},
+            {
+                "$set": {
+                    "status": "scraped",
+                    "scraped_data_id": saved["_id"]
+                }
+            }
+        )
+
+        scraped_doc['_id'] = saved['_id']
+        return ScrapedDataModel.format_scraped_response(scraped_doc)
+
+    except Exception:
+        # Update status to failed
+        keywords_collection.update_one(
+            {"_id": ObjectId(keyword_id)},
+            {"$set": {"status": "scraping_failed"}}
+        )
+        raise
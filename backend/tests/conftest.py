@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Modules create the MongoDB client at import time; point it at a local URI so
+# tests never resolve the production SRV record (pymongo connects lazily)
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+
+# Backend modules import each other as top-level packages (utils, models, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture
+def read_fixture():
+    """Return a loader for files in tests/fixtures"""
+    def read(name):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            return f.read()
+    return read
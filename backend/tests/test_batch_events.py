@@ -0,0 +1,140 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from config import Config
+from services import batch_events
+
+
+class FakeJobs:
+    """batch_jobs collection returning queued job documents, one per find_one"""
+
+    def __init__(self, docs, on_read=None):
+        self.docs = list(docs)
+        self.on_read = on_read
+
+    def find_one(self, query, projection=None):
+        if self.on_read:
+            on_read, self.on_read = self.on_read, None
+            on_read()
+        doc = self.docs.pop(0) if len(self.docs) > 1 else self.docs[0]
+        results_slice = (projection or {}).get("results")
+        if isinstance(results_slice, dict):
+            skip, limit = results_slice["$slice"]
+            doc = {**doc, "results": doc.get("results", [])[skip:skip + limit]}
+        return doc
+
+
+class FakeItems:
+    def __init__(self, items=()):
+        self.items = list(items)
+
+    def find(self, query, projection=None):
+        """Processing items whose lease is still live, like the real query"""
+        live_after = query["lease_expires_at"]["$gt"]
+        return FakeCursor([
+            item for item in self.items
+            if item.get("status", "processing") == query["status"]
+            and item.get("lease_expires_at", live_after + timedelta(minutes=5)) > live_after
+        ])
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda item: item.get(key, 0), reverse=direction < 0))
+
+
+def job(status, results=(), **fields):
+    return {"job_id": "job-1", "status": status, "total_keywords": 3,
+            "processed": len(results), "failed": 0, "results": list(results), **fields}
+
+
+def parse_events(stream):
+    events = []
+    for chunk in stream:
+        if chunk.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        events.append((fields["event"], json.loads(fields["data"]), fields.get("id")))
+    return events
+
+
+@pytest.fixture(autouse=True)
+def quick_polls(monkeypatch):
+    monkeypatch.setattr(Config, "BATCH_EVENTS_POLL_SECONDS", 0.01)
+
+
+def test_stage_published_while_the_job_is_read_is_delivered(monkeypatch):
+    item = {"_id": ObjectId(), "job_id": "job-1", "main_keyword": "tig welding"}
+    # A worker moves the item on while the stream is reading the job
+    jobs = FakeJobs([job("processing"), job("completed_successfully")],
+                    on_read=lambda: batch_events.publish_stage(item, "Writing"))
+    monkeypatch.setattr(batch_events, "batch_jobs_collection", jobs)
+    monkeypatch.setattr(batch_events, "batch_job_items_collection", FakeItems())
+
+    events = parse_events(batch_events.stream_job_events("job-1"))
+
+    assert [name for name, _, _ in events] == ["snapshot", "stage", "progress", "done"]
+    assert events[1][1] == {"item_id": str(item["_id"]), "main_keyword": "tig welding", "stage": "Writing"}
+
+
+def test_in_flight_stages_are_keyed_by_item(monkeypatch):
+    # The same keyword can appear on several rows of one upload
+    first, second = ObjectId(), ObjectId()
+    items = FakeItems([
+        {"_id": first, "main_keyword": "mig welding", "stage": "Scraping"},
+        {"_id": second, "main_keyword": "mig welding", "stage": "Writing"},
+    ])
+    monkeypatch.setattr(batch_events, "batch_job_items_collection", items)
+    monkeypatch.setattr(batch_events, "batch_jobs_collection", FakeJobs([job("completed_successfully")]))
+
+    (name, snapshot, _), _done = parse_events(batch_events.stream_job_events("job-1"))
+
+    assert snapshot["in_flight"] == {
+        str(first): {"main_keyword": "mig welding", "stage": "Scraping"},
+        str(second): {"main_keyword": "mig welding", "stage": "Writing"},
+    }
+
+
+def test_reconnect_snapshot_skips_results_already_seen(monkeypatch):
+    results = [{"item_id": str(n), "main_keyword": f"keyword {n}"} for n in range(3)]
+    monkeypatch.setattr(batch_events, "batch_jobs_collection", FakeJobs([job("completed_successfully", results)]))
+    monkeypatch.setattr(batch_events, "batch_job_items_collection", FakeItems())
+
+    (_, snapshot, event_id), _done = parse_events(batch_events.stream_job_events("job-1", seen_results=2))
+
+    assert snapshot["results_offset"] == 2
+    assert snapshot["results"] == results[2:]
+    assert event_id == "3"
+
+
+def test_result_events_carry_their_position(monkeypatch):
+    results = [{"item_id": "a", "main_keyword": "one"}, {"item_id": "b", "main_keyword": "two"}]
+    jobs = FakeJobs([job("processing"), job("completed_successfully", results)])
+    monkeypatch.setattr(batch_events, "batch_jobs_collection", jobs)
+    monkeypatch.setattr(batch_events, "batch_job_items_collection", FakeItems())
+
+    events = parse_events(batch_events.stream_job_events("job-1"))
+
+    assert [(name, event_id) for name, _, event_id in events if name == "result"] == [("result", "1"), ("result", "2")]
+
+
+def test_snapshot_leaves_out_items_whose_lease_expired(monkeypatch):
+    # A dead worker's item stays 'processing' until it is leased again
+    live, dead = ObjectId(), ObjectId()
+    now = datetime.utcnow()
+    items = FakeItems([
+        {"_id": live, "main_keyword": "tig welding", "stage": "Writing", "row_number": 1,
+         "lease_expires_at": now + timedelta(minutes=5)},
+        {"_id": dead, "main_keyword": "mig welding", "stage": "Scraping", "row_number": 2,
+         "lease_expires_at": now - timedelta(minutes=5)},
+    ])
+    monkeypatch.setattr(batch_events, "batch_job_items_collection", items)
+    monkeypatch.setattr(batch_events, "batch_jobs_collection", FakeJobs([job("completed_successfully")]))
+
+    (_, snapshot, _), _done = parse_events(batch_events.stream_job_events("job-1"))
+
+    assert list(snapshot["in_flight"]) == [str(live)]
+    assert [item["item_id"] for item in batch_events.get_job_in_flight("job-1")] == [str(live)]
@@ -0,0 +1,120 @@
+import io
+import tempfile
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from services import batch_ingest
+from services.batch_ingest import INGESTING_STATUS, create_batch_job
+from services.errors import ServiceError
+
+
+class FakeCollection:
+    """Records writes, in order, into a log shared by both collections"""
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.docs = []
+        self.fail_updates = False
+
+    def insert_one(self, doc):
+        self.log.append((self.name, "insert", doc.get("status")))
+        self.docs.append(dict(doc))
+
+    def insert_many(self, docs, ordered=True):
+        self.log.append((self.name, "insert", len(docs)))
+        self.docs.extend(dict(doc) for doc in docs)
+
+    def update_one(self, query, update):
+        if self.fail_updates:
+            raise ConnectionError("unreachable")
+        self.log.append((self.name, "update", update["$set"].get("status")))
+        for doc in self.docs:
+            if doc["job_id"] == query["job_id"]:
+                doc.update(update["$set"])
+
+    def delete_many(self, query):
+        self.log.append((self.name, "delete"))
+        self.docs = [doc for doc in self.docs if doc["job_id"] != query["job_id"]]
+
+    delete_one = delete_many
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    log = []
+    jobs, items = FakeCollection("jobs", log), FakeCollection("items", log)
+    monkeypatch.setattr(batch_ingest, "batch_jobs_collection", jobs)
+    monkeypatch.setattr(batch_ingest, "batch_job_items_collection", items)
+    return jobs, items, log
+
+
+def upload(text, filename="keywords.csv"):
+    return FileStorage(stream=io.BytesIO(text.encode("utf-8")), filename=filename)
+
+
+def spooled_upload(text, filename="keywords.csv"):
+    """Upload stored the way Werkzeug stores multipart files"""
+    stream = tempfile.SpooledTemporaryFile(max_size=16)
+    stream.write(text.encode("utf-8"))
+    stream.seek(0)
+    return FileStorage(stream=stream, filename=filename)
+
+
+class LineOnlyStream:
+    """Binary stream offering only iteration and read(), like SpooledTemporaryFile
+    on Python 3.9/3.10, which has no readable()"""
+
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+    def __iter__(self):
+        return iter(self._buffer)
+
+
+GOOD_ROWS = "tig welding,torch,tungsten,argon,filler\nmig welding,wire,gas,gun,liner\n"
+
+
+def test_job_exists_before_its_items_and_is_queued_after(collections):
+    jobs, items, log = collections
+
+    ingest = create_batch_job("job-1", upload(GOOD_ROWS + "too,short\n"), max_workers=2)
+
+    assert log == [("jobs", "insert", INGESTING_STATUS), ("items", "insert", 2), ("jobs", "update", "queued")]
+    assert ingest["valid_rows"] == 2 and ingest["skipped_rows"] == 1
+    assert jobs.docs[0]["total_keywords"] == 2
+    assert len(items.docs) == 2
+
+
+def test_failed_ingest_removes_the_job_and_its_items(collections):
+    jobs, items, _ = collections
+
+    with pytest.raises(ServiceError):
+        create_batch_job("job-1", upload("too,short\n"), max_workers=2)
+
+    assert jobs.docs == [] and items.docs == []
+
+
+def test_failure_to_queue_the_job_removes_it(collections):
+    jobs, items, _ = collections
+    jobs.fail_updates = True
+
+    with pytest.raises(ConnectionError):
+        create_batch_job("job-1", upload(GOOD_ROWS), max_workers=2)
+
+    assert jobs.docs == [] and items.docs == []
+
+
+@pytest.mark.parametrize("make_upload", [
+    spooled_upload,
+    lambda text: FileStorage(stream=LineOnlyStream(text.encode("utf-8")), filename="keywords.csv"),
+])
+def test_csv_rows_are_read_from_upload_streams(make_upload):
+    text = '\ufefftig welding,torch,tungsten,argon,"filler\nrod"\n' + GOOD_ROWS
+    rows = list(batch_ingest.iter_upload_rows(make_upload(text)))
+    assert rows[0] == ["tig welding", "torch", "tungsten", "argon", "filler\nrod"]
+    assert len(rows) == 3
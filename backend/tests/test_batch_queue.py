@@ -0,0 +1,64 @@
+import pytest
+
+# batch_queue imports the whole keyword pipeline, down to the Gemini client
+pytest.importorskip("google.generativeai")
+
+from bson import ObjectId
+from pymongo.results import UpdateResult
+
+from services import batch_queue
+from services.batch_queue import BatchWorker, renew_lease
+
+
+class FakeItems:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def update_one(self, query, update):
+        matched = int(query.get("lease_owner") == self.owner)
+        return UpdateResult({"n": matched, "nModified": matched}, acknowledged=True)
+
+
+@pytest.fixture
+def item():
+    return {"_id": ObjectId(), "job_id": "job-1", "main_keyword": "tig welding",
+            "keywords": ["a", "b", "c", "d"], "attempts": 1}
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(batch_queue, "publish_stage", lambda item, stage: events.append(stage))
+    monkeypatch.setattr(batch_queue.batch_status, "set_fields", lambda job_id, **fields: None)
+    return events
+
+
+def test_renew_lease_reports_a_lost_lease_without_publishing(item, published, monkeypatch):
+    monkeypatch.setattr(batch_queue, "batch_job_items_collection", FakeItems(owner="worker-2"))
+
+    assert renew_lease(item, "worker-2", "Scraping").matched_count == 1
+    assert renew_lease(item, "worker-1", "Writing").matched_count == 0
+    assert published == ["Scraping"]
+
+
+def test_worker_stops_at_the_next_stage_once_its_lease_is_lost(item, published, monkeypatch):
+    monkeypatch.setattr(batch_queue, "batch_job_items_collection", FakeItems(owner="worker-2"))
+    stages_run = []
+
+    def pipeline(main_keyword, keywords, on_stage, **kwargs):
+        for stage in ("Scraping", "Writing", "Metadata"):
+            on_stage(stage)
+            stages_run.append(stage)
+        return "keyword-id"
+
+    def must_not_touch_item(*args, **kwargs):
+        raise AssertionError("a stale worker settled or requeued the item")
+
+    monkeypatch.setattr(batch_queue, "run_keyword_pipeline", pipeline)
+    monkeypatch.setattr(batch_queue, "settle_item", must_not_touch_item)
+    monkeypatch.setattr(batch_queue, "requeue_item", must_not_touch_item)
+
+    BatchWorker("worker-1").process_item(item)
+
+    assert stages_run == []
+    assert published == []
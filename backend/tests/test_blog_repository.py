@@ -0,0 +1,171 @@
+import random
+from datetime import datetime
+
+import bson
+import pytest
+from bson import ObjectId
+
+from models import blog_repository
+from models.blog_model import BlogModel, HTML_FIELDS, RENDITION_FIELDS
+from models.blog_repository import DOWNLOAD_FIELDS, BlogRepository
+
+# Large per-blog fields no read view needs over the wire
+BULKY_FIELDS = ("original_html", "content_sections", "subheadings", "steps")
+
+# Upper bound on the BSON bytes each view reads for the fixture blog (about
+# 44KB in full). Views that render HTML fetch the served renditions, which
+# are stored compressed; everything else is a few hundred bytes.
+VIEW_BYTE_LIMITS = {
+    "summary": 512,
+    "integration_status": 128,
+    "with_images": 12_000,
+    "batch_preview": 12_000,
+    "export": 18_000,
+    "download_html": 3_500,
+    "download_txt": 3_500,
+    "download_json": 3_500,
+    "publish_html": 3_000,
+}
+
+# Views that never render the blog and so must not fetch any HTML or rendition
+METADATA_VIEWS = ("summary", "integration_status")
+
+
+def project(doc, projection):
+    """Apply an inclusion projection the way MongoDB does.
+
+    images_count is the only computed field the views use.
+    """
+    projected = {key: value for key, value in doc.items() if key == "_id" or projection.get(key) == 1}
+    if "images_count" in projection:
+        projected["images_count"] = len(doc.get("integrated_images") or [])
+    return projected
+
+
+def article_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+WORDS = ("weld arc torch tungsten filler rod argon bead joint puddle amperage "
+         "polarity travel angle shielding gas penetration spatter clean steel "
+         "aluminum stainless heat distortion tack root pass cap practice").split()
+
+
+def make_blog_doc():
+    """A finished blog shaped like production documents: ~1,800 words of
+    non-repeating text, so the packed HTML fields compress realistically"""
+    rng = random.Random(17)
+    sections = [article_text(rng, 300) for _ in range(6)]
+    body = "<h1>TIG welding</h1>" + "".join(f"<h2>Part {n}</h2><p>{text}</p>" for n, text in enumerate(sections))
+    with_images = body.replace("</h2>", '</h2><img src="https://example.com/a.jpg" alt="weld">', 2)
+    publish_ready = f"<article>{with_images}</article>"
+    doc = BlogModel.create_blog_document(ObjectId(), {
+        "title": "TIG welding",
+        "subheadings": [f"Part {n}" for n in range(6)],
+        "content_sections": sections,
+    }, body, original_html=f"<div>{article_text(rng, 1800)}</div>")
+    doc.update({
+        "_id": ObjectId(),
+        "enhanced_html": BlogModel.pack_html(body),
+        "html_with_images": BlogModel.pack_html(with_images),
+        "publish_ready_html": BlogModel.pack_html(publish_ready),
+        "integrated_images": [{"url": f"https://example.com/{n}.jpg", "alt": "weld"} for n in range(4)],
+        "steps": {"content_sections": {"sections": sections}},
+        "post_title": "TIG welding basics",
+        "meta_title": "TIG welding basics | Guide",
+        "meta_description": "How to TIG weld",
+        "post_description": "A guide",
+        "slug": "tig-welding-basics",
+        "featured_image": {"url": "https://example.com/a.jpg"},
+        "meta_keywords": "tig, welding",
+        "author": "Editor",
+        "canonical_url": "https://example.com/tig-welding-basics",
+        "word_count": 1800,
+        "updated_at": datetime(2024, 5, 1),
+    })
+    doc.update(BlogModel.build_renditions(doc, publish_ready))
+    return doc
+
+
+@pytest.fixture
+def blog_doc():
+    return make_blog_doc()
+
+
+@pytest.mark.parametrize("view", sorted(BlogRepository.VIEWS))
+def test_views_leave_out_bulky_fields(view):
+    projection = BlogRepository.VIEWS[view]
+    assert not set(BULKY_FIELDS) & set(projection)
+    if view in METADATA_VIEWS:
+        assert not set(HTML_FIELDS) & set(projection)
+    if not view.startswith("download_") and view != "export":
+        assert not set(RENDITION_FIELDS.values()) & set(projection)
+
+
+@pytest.mark.parametrize("format", ["html", "txt", "json"])
+def test_download_views_hold_only_their_rendition(format, blog_doc):
+    projection = BlogRepository.VIEWS[f"download_{format}"]
+    rendition = {"publish_ready_html", "final_html"} if format == "html" else {RENDITION_FIELDS[format]}
+    assert set(projection) == rendition | set(DOWNLOAD_FIELDS)
+    assert BlogModel.stored_rendition(project(blog_doc, projection), format) == \
+        BlogModel.stored_rendition(blog_doc, format)
+
+
+@pytest.mark.parametrize("view", ["with_images", "batch_preview", "export"])
+def test_html_views_serve_the_same_html_as_the_full_document(view, blog_doc):
+    projected = project(blog_doc, BlogRepository.VIEWS[view])
+    assert BlogModel.best_html(projected) == BlogModel.best_html(blog_doc)
+
+
+def test_publish_html_view(blog_doc):
+    projected = project(blog_doc, BlogRepository.VIEWS["publish_html"])
+    assert set(projected) - {"_id"} <= {"publish_ready_html", "final_html"}
+    assert BlogModel.publish_html(projected) == BlogModel.publish_html(blog_doc)
+
+
+@pytest.mark.parametrize("format", ["txt", "json"])
+def test_export_view_renders_the_same_downloads(format, blog_doc):
+    projected = project(blog_doc, BlogRepository.VIEWS["export"])
+    html_content = BlogModel.best_html(blog_doc)
+    assert BlogModel.render_download(projected, format, html_content) == \
+        BlogModel.render_download(blog_doc, format, html_content)
+
+
+def test_find_by_keyword_sends_the_view_projection(monkeypatch):
+    calls = []
+
+    class Collection:
+        def find_one(self, query, projection):
+            calls.append(projection)
+
+    monkeypatch.setattr(blog_repository, "blogs_collection", Collection())
+    BlogRepository.find_by_keyword(str(ObjectId()), "summary")
+    BlogRepository.find_by_keyword(str(ObjectId()))
+    assert calls == [BlogRepository.VIEWS["summary"], None]
+
+
+def test_every_view_has_a_byte_limit():
+    assert set(VIEW_BYTE_LIMITS) == set(BlogRepository.VIEWS)
+
+
+@pytest.mark.parametrize("view", sorted(VIEW_BYTE_LIMITS))
+def test_view_reads_fewer_bytes_than_the_whole_blog(view, blog_doc):
+    full_size = len(bson.encode(blog_doc))
+    projected_size = len(bson.encode(project(blog_doc, BlogRepository.VIEWS[view])))
+
+    assert projected_size <= VIEW_BYTE_LIMITS[view]
+    assert projected_size < full_size / 2
+
+
+def test_unknown_views_are_rejected(monkeypatch):
+    class Collection:
+        def find_one(self, query, projection):
+            raise AssertionError("queried with an unknown view")
+
+        find = find_one
+
+    monkeypatch.setattr(blog_repository, "blogs_collection", Collection())
+    with pytest.raises(ValueError, match="Unknown blog view: summry"):
+        BlogRepository.find_by_keyword(str(ObjectId()), "summry")
+    with pytest.raises(ValueError, match="Unknown blog view: exprt"):
+        BlogRepository.find_by_keywords([str(ObjectId())], "exprt")
@@ -0,0 +1,59 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from utils import html_parsing, scraper
+from utils.html_parsing import make_soup
+
+PARSERS = ["lxml", "html.parser"]
+
+
+@pytest.fixture(params=PARSERS)
+def parser(request, monkeypatch):
+    monkeypatch.setattr(html_parsing, "HTML_PARSER", request.param)
+    return request.param
+
+
+def full_soup(parser):
+    """make_soup stand-in that builds the whole tree, as the scraper did before straining"""
+    return lambda markup, name=None, class_=None: BeautifulSoup(markup, parser)
+
+
+@pytest.mark.parametrize("engine, fixture, expected", [
+    ("duckduckgo", "duckduckgo_serp.html", 5),
+    ("bing", "bing_serp.html", 5),
+])
+def test_strained_serp_parse_matches_full_parse(engine, fixture, expected, parser, read_fixture, monkeypatch):
+    markup = read_fixture(fixture)
+    welding_scraper = scraper.WeldingScraper()
+    parse = getattr(welding_scraper, f"_parse_{engine}")
+
+    strained = parse(markup)
+    monkeypatch.setattr(scraper, "make_soup", full_soup(parser))
+    full = parse(markup)
+
+    assert len(strained) == expected
+    assert strained == full
+
+
+@pytest.mark.parametrize("fixture, name, class_", [
+    ("duckduckgo_serp.html", "div", "web-result"),
+    ("bing_serp.html", "li", "b_algo"),
+    ("pexels_search.html", "img", "photo-item__img"),
+    ("bing_images.html", "a", "iusc"),
+])
+def test_strainer_keeps_every_element_with_the_class(fixture, name, class_, parser, read_fixture):
+    markup = read_fixture(fixture)
+
+    strained = make_soup(markup, name, class_=class_).find_all(name, class_=class_)
+    full = BeautifulSoup(markup, parser).find_all(name, class_=class_)
+
+    assert strained
+    assert [str(element) for element in strained] == [str(element) for element in full]
+
+
+def test_strainer_matches_class_tokens_not_substrings(parser):
+    markup = '<div class="web-results">no</div><div class="result web-result ">yes</div>'
+
+    found = make_soup(markup, "div", class_="web-result").find_all("div")
+
+    assert [element.get_text() for element in found] == ["yes"]
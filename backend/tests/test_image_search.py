@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from config import Config
+from utils.image_search import ImageSearcher
+
+
+def candidates(n):
+    return [{"url": f"https://example.com/{idx}.jpg", "domain": "example.com"} for idx in range(n)]
+
+
+@pytest.fixture
+def searcher(monkeypatch):
+    monkeypatch.setattr(Config, "IMAGE_VALIDATION_WORKERS", 8)
+    return ImageSearcher()
+
+
+def stub_checks(monkeypatch, searcher, outcomes):
+    """Stub is_valid_image_url: candidate idx sleeps outcomes[idx][1] seconds
+    and returns outcomes[idx][0]. Returns the set of finished indices."""
+    finished = set()
+    lock = threading.Lock()
+
+    def is_valid_image_url(url, width=None, height=None):
+        idx = int(url.rsplit("/", 1)[1].split(".")[0])
+        valid, delay = outcomes[idx]
+        time.sleep(delay)
+        with lock:
+            finished.add(idx)
+        return valid
+
+    monkeypatch.setattr(searcher, "is_valid_image_url", is_valid_image_url)
+    return finished
+
+
+def urls(images):
+    return [img["url"].rsplit("/", 1)[1] for img in images]
+
+
+def test_picks_the_first_valid_candidates_whatever_finishes_first(searcher, monkeypatch):
+    # The first candidate is valid but slowest; later ones answer at once
+    stub_checks(monkeypatch, searcher, [(True, 0.3), (False, 0), (True, 0), (True, 0), (True, 0)])
+
+    for _ in range(3):
+        assert urls(searcher.validate_images(candidates(5), 2)) == ["0.jpg", "2.jpg"]
+
+
+def test_stops_once_the_first_valid_candidates_are_known(searcher, monkeypatch):
+    # Candidate 3 hangs; the first two valid ones are already settled without it
+    finished = stub_checks(monkeypatch, searcher, [(True, 0.05), (False, 0), (True, 0.1), (True, 2)])
+
+    started = time.monotonic()
+    assert urls(searcher.validate_images(candidates(4), 2)) == ["0.jpg", "2.jpg"]
+    assert time.monotonic() - started < 1
+    assert 3 not in finished
+
+
+def test_waits_for_a_slow_earlier_candidate_before_later_valid_ones(searcher, monkeypatch):
+    # 1 is checked last but is invalid, so 3 takes its place
+    stub_checks(monkeypatch, searcher, [(True, 0), (False, 0.2), (False, 0), (True, 0), (True, 0)])
+
+    assert urls(searcher.validate_images(candidates(5), 2)) == ["0.jpg", "3.jpg"]
+
+
+def test_orders_the_pick_by_domain_priority(searcher, monkeypatch):
+    stub_checks(monkeypatch, searcher, [(True, 0), (True, 0), (True, 0)])
+    images = candidates(3)
+    images[1]["url"] = f"https://{searcher.preferred_domains[0]}/1.jpg"
+
+    assert urls(searcher.validate_images(images, 2)) == ["1.jpg", "0.jpg"]
@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from config import Config
+from utils import llm_generator
+from utils.llm_cache import LLMResponseCache
+from utils.llm_generator import BlogGenerator, regenerating
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Gemini stand-in that numbers its responses"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt):
+        self.calls += 1
+        return FakeResponse(f"Response {self.calls}")
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    # Without a collection the cache keeps only its memory tier
+    monkeypatch.setattr(llm_generator, "llm_response_cache", LLMResponseCache(None))
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", True)
+    generator = BlogGenerator.__new__(BlogGenerator)
+    generator.model_name = "test-model"
+    generator.model = FakeModel()
+    return generator
+
+
+def test_regenerating_skips_the_cached_response_and_replaces_it(generator):
+    first = generator._generate_text("Write a title")
+    assert generator._generate_text("Write a title") == first
+
+    with regenerating():
+        fresh = generator._generate_text("Write a title")
+
+    assert fresh != first
+    assert generator._generate_text("Write a title") == fresh
+    assert generator.model.calls == 2
+
+
+def test_regenerating_reaches_content_section_threads(generator, monkeypatch):
+    monkeypatch.setattr(BlogGenerator, "generate_content_section",
+                        lambda self, subheading, *args, **kwargs: self._generate_text(subheading))
+    monkeypatch.setattr(BlogGenerator, "add_outbound_links", lambda self, content: content)
+    subheadings = ["Setup", "Technique"]
+
+    cached = generator.generate_content_sections(subheadings, [], "tig welding", [])
+    with regenerating():
+        fresh = generator.generate_content_sections(subheadings, [], "tig welding", [])
+
+    assert not set(cached) & set(fresh)
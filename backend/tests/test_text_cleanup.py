@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+from utils.text_cleanup import CODE_FENCES, GENERATION_ARTIFACTS, INSTRUCTION_ARTIFACTS, META_COMMENTARY
+
+# Golden cases: each input with the output of the original rule-by-rule
+# cleanup methods, recorded before the rules were precompiled and merged
+CLEANUPS = {
+    "generation_artifacts": lambda text: GENERATION_ARTIFACTS(text).strip(),
+    "meta_commentary": lambda text: META_COMMENTARY(text).strip(),
+    "llm_output": lambda text: INSTRUCTION_ARTIFACTS(CODE_FENCES(text)).strip(),
+    "llm_output_keep_instructions": lambda text: CODE_FENCES(text).strip(),
+}
+
+GOLDEN_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "text_cleanup_golden.json")
+
+# The generator methods that wrap each pipeline
+METHODS = {
+    "generation_artifacts": lambda generator, text: generator._clean_generation_artifacts(text),
+    "meta_commentary": lambda generator, text: generator._clean_meta_commentary(text),
+    "llm_output": lambda generator, text: generator._clean_llm_output(text),
+    "llm_output_keep_instructions": lambda generator, text: generator._clean_llm_output(text, remove_instructions=False),
+}
+
+
+def golden_cases():
+    with open(GOLDEN_CASES, encoding="utf-8") as f:
+        cases = json.load(f)
+    return [pytest.param(case, id=f"{case['cleanup']}-{n}") for n, case in enumerate(cases)]
+
+
+@pytest.mark.parametrize("case", golden_cases())
+def test_pipelines_match_original_cleanup(case):
+    assert CLEANUPS[case["cleanup"]](case["input"]) == case["expected"]
+
+
+@pytest.mark.parametrize("case", golden_cases())
+def test_generator_methods_match_original_cleanup(case):
+    pytest.importorskip("google.generativeai")
+    from utils.llm_generator import BlogGenerator
+
+    generator = BlogGenerator.__new__(BlogGenerator)  # The cleanup methods need no client
+    assert METHODS[case["cleanup"]](generator, case["input"]) == case["expected"]
+
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.image_validation_cache import ImageValidationCache
+from utils.llm_cache import LLMResponseCache
+from utils.serp_cache import SerpCache
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the cache's find_one/update_one"""
+
+    def __init__(self):
+        self.docs = {}
+        self.down = False
+
+    def find_one(self, query, projection=None):
+        if self.down:
+            raise ConnectionError("unreachable")
+        doc = self.docs.get(query["_id"])
+        if doc and doc["expires_at"] > query["expires_at"]["$gt"]:
+            return dict(doc)
+        return None
+
+    def update_one(self, query, update, upsert=False):
+        if self.down:
+            raise ConnectionError("unreachable")
+        self.docs.setdefault(query["_id"], {}).update(update["$set"])
+
+
+@pytest.fixture
+def collection():
+    return FakeCollection()
+
+
+def test_memory_then_persistent_hits(collection):
+    cache = LLMResponseCache(collection, max_entries=1)
+    first, second = cache.make_key("model", "first"), cache.make_key("model", "second")
+    cache.set(first, "one")
+    cache.set(second, "two")  # Evicts "first" from memory
+
+    assert cache.get(second) == "two"
+    assert cache.get(first) == "one"
+    assert cache.get(cache.make_key("model", "other")) is None
+    assert cache.stats() == {"memory_hits": 1, "persistent_hits": 1, "misses": 1, "stores": 2,
+                             "memory_entries": 1, "hit_rate": 0.6667}
+
+
+def test_expired_entries_are_misses_in_both_tiers(collection):
+    cache = LLMResponseCache(collection)
+    key = cache.make_key("model", "prompt")
+    cache.set(key, "text")
+    past = datetime.utcnow() - timedelta(seconds=1)
+    cache._entries[key]["expires_at"] = past
+    collection.docs[key]["expires_at"] = past
+
+    assert cache.get(key) is None
+    assert cache.stats()["memory_entries"] == 0
+
+
+def test_persistent_failures_are_misses(collection):
+    cache = LLMResponseCache(collection)
+    collection.down = True
+    cache.set("key", "text")  # Still kept in memory
+    cache._entries.clear()
+
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_image_failures_use_the_negative_ttl(collection):
+    cache = ImageValidationCache(collection, positive_ttl_seconds=3600, negative_ttl_seconds=60)
+    good = cache.set("https://example.com/a.jpg", True, status=200, content_type="image/jpeg")
+    bad = cache.set("https://example.com/b.jpg", False, status=404)
+
+    assert good["expires_at"] - good["created_at"] == timedelta(seconds=3600)
+    assert bad["expires_at"] - bad["created_at"] == timedelta(seconds=60)
+
+    cache._entries.clear()
+    assert cache.get("https://example.com/b.jpg")["status"] == 404
+    assert cache.get("https://example.com/a.jpg")["valid"] is True
+    stats = cache.stats()
+    assert (stats["persistent_hits"], stats["negative_hits"]) == (2, 1)
+
+
+def test_serp_results_are_keyed_by_normalized_query_and_copied(collection):
+    cache = SerpCache(collection)
+    results = [{"title": "TIG basics", "snippet": "...", "source": "duckduckgo"}]
+    cache.set("duckduckgo", "TIG  Welding ", results)
+    results[0]["title"] = "changed"
+
+    cached = cache.get("duckduckgo", "tig welding")
+    assert cached[0]["title"] == "TIG basics"
+    cached[0]["title"] = "changed"
+    assert cache.get("duckduckgo", "tig welding")[0]["title"] == "TIG basics"
+    assert cache.get("bing", "tig welding") is None
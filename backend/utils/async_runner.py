@@ -0,0 +1,26 @@
+import asyncio
+import threading
+
+# One event loop on a daemon thread, shared by every sync caller that needs to
+# run a coroutine (e.g. Gemini requests). Keeping a single loop lets prompts
+# from many sessions be in flight together and keeps async clients bound to
+# the loop that created them.
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop():
+    """Return the shared background event loop, starting it on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="async-runner")
+            thread.daemon = True
+            thread.start()
+        return _loop
+
+
+def run_coroutine(coro):
+    """Run a coroutine on the shared loop and block until it finishes"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from config import Config
+
+# Process-wide caps on how many callers may be inside each stage at once
+_stage_sizes = {
+    'gemini': Config.GEMINI_MAX_CONCURRENCY,
+    'scraping': Config.SCRAPE_MAX_CONCURRENCY,
+}
+
+_stage_semaphores = {
+    stage: threading.BoundedSemaphore(size) for stage, size in _stage_sizes.items()
+}
+
+# asyncio semaphores are created lazily on the loop that first uses them;
+# async stages are expected to run on the shared loop in utils.async_runner
+_async_stage_semaphores = {}
+
+
+@contextmanager
+def stage_limit(stage):
+    """Block until a slot for the given stage is free, then hold it for the with-block"""
+    semaphore = _stage_semaphores[stage]
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+@asynccontextmanager
+async def async_stage_limit(stage):
+    """Async counterpart of stage_limit for coroutines on the shared event loop"""
+    semaphore = _async_stage_semaphores.get(stage)
+    if semaphore is None:
+        semaphore = _async_stage_semaphores[stage] = asyncio.Semaphore(_stage_sizes[stage])
+    async with semaphore:
+        yield
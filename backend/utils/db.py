@@ -1,4 +1,5 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
 from config import Config
 
 client = MongoClient(Config.MONGODB_URI)
@@ -11,9 +12,90 @@ images_collection = db['images']
 blogs_collection = db['blogs']
 product_knowledge_collection = db['product_knowledge']
 batch_jobs_collection = db['batch_jobs']  # Add this line
+batch_job_items_collection = db['batch_job_items']  # One document per sheet row
+generation_sessions_collection = db['generation_sessions']
+llm_cache_collection = db['llm_cache']
+image_validation_cache_collection = db['image_validation_cache']
+serp_cache_collection = db['serp_cache']
 
-# Initialize product knowledge if not exists
-from models.product_knowledge_model import ProductKnowledgeModel
-if product_knowledge_collection.count_documents({}) == 0:
-    default_knowledge = ProductKnowledgeModel.get_default_product_knowledge()
-    product_knowledge_collection.insert_one(default_knowledge)
\ No newline at end of file
+# Declarative index definitions, applied idempotently at startup by ensure_indexes().
+# Names are left to pymongo's defaults (e.g. keyword_id_1) so indexes created
+# earlier by hand or by older code are recognised rather than duplicated.
+INDEXES = [
+    (keywords_collection, [
+        IndexModel([("created_at", DESCENDING)]),
+    ]),
+    (scraped_data_collection, [
+        IndexModel([("keyword_id", ASCENDING)], unique=True),
+    ]),
+    (images_collection, [
+        IndexModel([("keyword_id", ASCENDING)], unique=True),
+    ]),
+    (blogs_collection, [
+        IndexModel([("keyword_id", ASCENDING)], unique=True),
+    ]),
+    (batch_jobs_collection, [
+        IndexModel([("job_id", ASCENDING)], unique=True),
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+    ]),
+    (batch_job_items_collection, [
+        IndexModel([("job_id", ASCENDING), ("row_number", ASCENDING)], unique=True),
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING), ("row_number", ASCENDING)]),
+    ]),
+    (generation_sessions_collection, [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]),
+    (llm_cache_collection, [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]),
+    (image_validation_cache_collection, [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]),
+    (serp_cache_collection, [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]),
+]
+
+
+def ensure_indexes():
+    """Create every index in INDEXES that does not exist yet.
+
+    Each index is created on its own so one failure (for example duplicate
+    keyword_id values blocking a unique index) does not stop the rest.
+    Returns the names of indexes that could not be created.
+    """
+    failed = []
+    for collection, models in INDEXES:
+        for model in models:
+            name = model.document["name"]
+            try:
+                collection.create_indexes([model])
+            except PyMongoError as e:
+                print(f"Could not create index {collection.name}.{name}: {str(e)}")
+                failed.append(f"{collection.name}.{name}")
+    return failed
+
+
+def missing_indexes():
+    """Return the declared indexes that are not present in the database"""
+    missing = []
+    for collection, models in INDEXES:
+        existing = collection.index_information()
+        for model in models:
+            name = model.document["name"]
+            if name not in existing:
+                missing.append(f"{collection.name}.{name}")
+    return missing
+
+
+def ensure_product_knowledge():
+    """Seed the default product knowledge if the collection is empty.
+
+    Called at app startup rather than on import, so importing a module never
+    talks to the database.
+    """
+    from models.product_knowledge_model import ProductKnowledgeModel
+    if product_knowledge_collection.count_documents({}) == 0:
+        default_knowledge = ProductKnowledgeModel.get_default_product_knowledge()
+        product_knowledge_collection.insert_one(default_knowledge)
@@ -0,0 +1,31 @@
+import hashlib
+from flask import Response, request
+
+DOWNLOAD_MIMETYPES = {
+    "html": "text/html",
+    "txt": "text/plain",
+    "json": "application/json",
+}
+
+
+def download_response(content, format, filename, etag=None, last_modified=None):
+    """Serve a blog download as an attachment with cache validators.
+
+    Uses the stored rendition's ETag when there is one, otherwise a digest
+    of the content, and answers 304 Not Modified when the client's
+    If-None-Match / If-Modified-Since show its copy is current.
+    """
+    mimetype = DOWNLOAD_MIMETYPES[format]
+    response = Response(
+        content,
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Type": f"{mimetype}; charset=utf-8",
+            "Cache-Control": "no-cache",  # Always revalidate, usually for a 304
+        },
+    )
+    response.set_etag(etag or hashlib.sha1(content.encode("utf-8")).hexdigest())
+    if last_modified:
+        response.last_modified = last_modified
+    return response.make_conditional(request)
@@ -0,0 +1,48 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from config import Config
+
+
+def _resolve_parser(preferred):
+    """Return the configured BeautifulSoup tree builder, falling back to html.parser"""
+    if preferred == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            print("lxml not installed, falling back to html.parser")
+            return 'html.parser'
+    return preferred
+
+
+# Chosen once at import time so every page uses the same backend
+HTML_PARSER = _resolve_parser(Config.HTML_PARSER)
+
+
+def _has_class(token):
+    """Match an element carrying ``token`` among its (possibly several) classes.
+
+    While parse_only is applied the class attribute is still the raw string
+    (e.g. "result results_links web-result "), so a plain string would only
+    match elements whose whole attribute equals it.
+    """
+    def matches(value):
+        if not value:
+            return False
+        values = value.split() if isinstance(value, str) else value
+        return token in values
+    return matches
+
+
+def make_soup(markup, name=None, class_=None):
+    """Parse markup, keeping only elements matching name/class_ when given.
+
+    SERP and image-search pages are mostly scripts and chrome around a few
+    result blocks; restricting the parse with a SoupStrainer skips building
+    the rest of the tree. class_ matches a single class token, like
+    find_all(class_=...). Matched elements keep their full subtree, so
+    callers can still search inside them.
+    """
+    if name or class_:
+        parse_only = SoupStrainer(name, class_=_has_class(class_) if class_ else None)
+    else:
+        parse_only = None
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=parse_only)
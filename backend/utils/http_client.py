@@ -0,0 +1,74 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+
+class HostThrottle:
+    """Per-host politeness: a minimum gap between request starts and a cap on
+    concurrent requests to the same host. Different hosts never wait on each other.
+    """
+
+    def __init__(self, min_interval, max_concurrent):
+        self.min_interval = min_interval
+        self.max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._next_start = {}
+        self._semaphores = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url):
+        host = urlparse(url).netloc.lower()
+        semaphore = self._semaphore(host)
+        with semaphore:
+            # Reserve the next start time for this host, then wait for it
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+_session = None
+_session_lock = threading.Lock()
+
+# Shared by the SERP scraper and image search
+host_throttle = HostThrottle(
+    min_interval=Config.SCRAPE_HOST_MIN_INTERVAL,
+    max_concurrent=Config.SCRAPE_HOST_MAX_CONCURRENCY,
+)
+
+
+def get_http_session():
+    """Return the process-wide pooled requests.Session (keep-alive per host)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def polite_get(url, **kwargs):
+    """GET through the pooled session, respecting the per-host throttle"""
+    with host_throttle.slot(url):
+        return get_http_session().get(url, **kwargs)
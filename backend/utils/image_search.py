@@ -1,10 +1,27 @@
-import requests
-from bs4 import BeautifulSoup
 from config import Config
 import time
 import json
 from urllib.parse import quote_plus, urlparse
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.http_client import HostThrottle, get_http_session, polite_get
+from utils.html_parsing import make_soup
+from utils.db import image_validation_cache_collection
+from utils.image_validation_cache import ImageValidationCache
+
+# HEAD checks only need a per-host concurrency cap, not the SERP pacing interval
+validation_throttle = HostThrottle(
+    min_interval=0,
+    max_concurrent=Config.IMAGE_VALIDATION_HOST_CONCURRENCY,
+)
+
+# Shared across searches and workers; counters are exposed at /api/image-validation-cache/stats
+image_validation_cache = ImageValidationCache(
+    image_validation_cache_collection,
+    max_entries=Config.IMAGE_VALIDATION_CACHE_MAX_ENTRIES,
+    positive_ttl_seconds=Config.IMAGE_VALIDATION_POSITIVE_TTL_SECONDS,
+    negative_ttl_seconds=Config.IMAGE_VALIDATION_NEGATIVE_TTL_SECONDS,
+)
 
 class ImageSearcher:
     def __init__(self):
@@ -39,37 +56,58 @@ class ImageSearcher:
             'linkedin.com',   # Requires login
         ]
     
-    def is_valid_image_url(self, url):
-        """Check if image URL is valid and accessible"""
+    def is_valid_image_url(self, url, width=None, height=None):
+        """Check if image URL is valid and accessible
+        
+        Outcomes are cached in image_validation_cache, so repeat candidates
+        across keywords skip the HEAD request. width/height are the dimensions
+        reported by the search engine and are stored with the result.
+        """
         if not url or not url.startswith(('http://', 'https://')):
             return False
         
+        # Parse URL to check domain
+        domain = urlparse(url).netloc.lower()
+        
+        # Skip blocked domains
+        if any(blocked in domain for blocked in self.blocked_domains):
+            return False
+        
+        if Config.IMAGE_VALIDATION_CACHE_ENABLED:
+            cached = image_validation_cache.get(url)
+            if cached:
+                return cached['valid']
+        
+        status = content_type = content_length = None
         try:
-            # Parse URL to check domain
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            
-            # Skip blocked domains
-            if any(blocked in domain for blocked in self.blocked_domains):
-                return False
-            
-            # Quick HEAD request to check if URL is accessible
-            response = requests.head(url, headers=self.headers, timeout=3, allow_redirects=True)
+            # Quick HEAD request over the pooled keep-alive session
+            with validation_throttle.slot(url):
+                response = get_http_session().head(url, headers=self.headers, timeout=3, allow_redirects=True)
             
-            # Check if response is successful
-            if response.status_code != 200:
-                return False
-            
-            # Check content type
+            status = response.status_code
             content_type = response.headers.get('content-type', '').lower()
-            if not any(img_type in content_type for img_type in ['image/', 'jpeg', 'jpg', 'png', 'gif', 'webp']):
-                return False
+            content_length = response.headers.get('content-length')
             
-            return True
+            # Check if response is successful and content type is an image
+            valid = status == 200 and any(
+                img_type in content_type for img_type in ['image/', 'jpeg', 'jpg', 'png', 'gif', 'webp']
+            )
             
         except Exception as e:
             print(f"URL validation failed for {url}: {str(e)}")
-            return False
+            valid = False
+        
+        if Config.IMAGE_VALIDATION_CACHE_ENABLED:
+            image_validation_cache.set(
+                url, valid,
+                status=status,
+                content_type=content_type,
+                content_length=int(content_length) if content_length and content_length.isdigit() else None,
+                width=width,
+                height=height,
+            )
+        
+        return valid
     
     def get_domain_priority(self, url):
         """Get priority score for domain (lower is better)"""
@@ -87,6 +125,62 @@ class ImageSearcher:
         except:
             return 999
     
+    def validate_images(self, images, count):
+        """Validate candidates concurrently and return the first count valid ones.
+
+        Checks fan out over a bounded pool, but the pick is the same as
+        checking in order: the first count valid candidates by position.
+        Outstanding checks are cancelled as soon as those are known, i.e.
+        every earlier candidate has been checked. Results are ordered by
+        domain priority, then by their original position.
+        """
+        if not images or count <= 0:
+            return []
+        
+        results = [None] * len(images)  # True/False once checked
+        executor = ThreadPoolExecutor(max_workers=min(Config.IMAGE_VALIDATION_WORKERS, len(images)))
+        try:
+            futures = {
+                executor.submit(self.is_valid_image_url, img['url'], img.get('width'), img.get('height')): idx
+                for idx, img in enumerate(images)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = bool(future.result())
+                if results[idx]:
+                    print(f"✓ Valid image from {images[idx]['domain']}")
+                else:
+                    print(f"✗ Invalid/inaccessible image from {images[idx]['domain']}")
+                
+                if self._first_valid_settled(results, count):
+                    break
+        finally:
+            # Drop queued checks; in-flight HEADs finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        valid = [(idx, images[idx]) for idx, ok in enumerate(results) if ok][:count]
+        for _, img in valid:
+            img['priority'] = self.get_domain_priority(img['url'])
+        valid.sort(key=lambda item: (item[1]['priority'], item[0]))
+        return [img for _, img in valid]
+    
+    @staticmethod
+    def _first_valid_settled(results, count):
+        """True once the first count valid results can no longer change.
+
+        That is when count results are valid with no unchecked (None)
+        result before the last of them.
+        """
+        found = 0
+        for ok in results:
+            if ok is None:
+                return False
+            if ok:
+                found += 1
+                if found >= count:
+                    return True
+        return False
+    
     def search_duckduckgo_images(self, query, count=5):
         """Search DuckDuckGo for images with validation"""
         images = []
@@ -96,7 +190,7 @@ class ImageSearcher:
             # DuckDuckGo image search URL
             search_url = f"https://duckduckgo.com/?q={quote_plus(query)}&iax=images&ia=images"
             
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = polite_get(search_url, headers=self.headers, timeout=10)
             
             # Parse the token from the page
             vqd_token = None
@@ -112,7 +206,7 @@ class ImageSearcher:
                 # Get actual image results
                 api_url = f"https://duckduckgo.com/i.js?l=us-en&o=json&q={quote_plus(query)}&vqd={vqd_token}&f=,,,&p=1"
                 
-                img_response = requests.get(api_url, headers=self.headers, timeout=10)
+                img_response = polite_get(api_url, headers=self.headers, timeout=10)
                 
                 if img_response.status_code == 200:
                     try:
@@ -146,21 +240,7 @@ class ImageSearcher:
             
             # Validate images
             print(f"Validating {len(images)} images from DuckDuckGo...")
-            for img in images:
-                if self.is_valid_image_url(img['url']):
-                    img['priority'] = self.get_domain_priority(img['url'])
-                    valid_images.append(img)
-                    print(f"✓ Valid image from {img['domain']}")
-                else:
-                    print(f"✗ Invalid/inaccessible image from {img['domain']}")
-                
-                if len(valid_images) >= count:
-                    break
-            
-            # Sort by priority (prefer reliable sources)
-            valid_images.sort(key=lambda x: x.get('priority', 999))
-            
-            time.sleep(1)  # Rate limiting
+            valid_images = self.validate_images(images, count)
             
         except Exception as e:
             print(f"Error searching DuckDuckGo images: {str(e)}")
@@ -175,8 +255,8 @@ class ImageSearcher:
         try:
             search_url = f"https://www.bing.com/images/search?q={quote_plus(query)}&form=HDRSC2"
             
-            response = requests.get(search_url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = polite_get(search_url, headers=self.headers, timeout=10)
+            soup = make_soup(response.text, 'a', class_='iusc')
             
             # Find image elements
             img_elements = soup.find_all('a', class_='iusc')[:count*3]
@@ -210,21 +290,7 @@ class ImageSearcher:
             
             # Validate images
             print(f"Validating {len(images)} images from Bing...")
-            for img in images:
-                if self.is_valid_image_url(img['url']):
-                    img['priority'] = self.get_domain_priority(img['url'])
-                    valid_images.append(img)
-                    print(f"✓ Valid image from {img['domain']}")
-                else:
-                    print(f"✗ Invalid/inaccessible image from {img['domain']}")
-                
-                if len(valid_images) >= count:
-                    break
-            
-            # Sort by priority
-            valid_images.sort(key=lambda x: x.get('priority', 999))
-            
-            time.sleep(1)  # Rate limiting
+            valid_images = self.validate_images(images, count)
             
         except Exception as e:
             print(f"Error searching Bing images: {str(e)}")
@@ -238,10 +304,10 @@ class ImageSearcher:
         # Search Pexels (has good API but we'll use web scraping)
         try:
             pexels_url = f"https://www.pexels.com/search/{quote_plus(query)}/"
-            response = requests.get(pexels_url, headers=self.headers, timeout=5)
+            response = polite_get(pexels_url, headers=self.headers, timeout=5)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = make_soup(response.text, 'img', class_='photo-item__img')
                 img_elements = soup.find_all('img', class_='photo-item__img')[:count]
                 
                 for idx, img in enumerate(img_elements):
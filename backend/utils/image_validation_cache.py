@@ -0,0 +1,50 @@
+import hashlib
+from datetime import timedelta
+
+from utils.two_tier_cache import TwoTierCache
+
+
+class ImageValidationCache(TwoTierCache):
+    """Shared cache of image URL validation outcomes.
+
+    Each record holds the HEAD status, content type, content length and the
+    dimensions reported by the search engine. Valid outcomes live for
+    ``positive_ttl_seconds``; failures (bad status, wrong type, timeouts)
+    for the usually much shorter ``negative_ttl_seconds``.
+    """
+
+    name = "Image validation cache"
+
+    def __init__(self, collection, max_entries=5000, positive_ttl_seconds=7 * 24 * 3600,
+                 negative_ttl_seconds=6 * 3600):
+        super().__init__(collection, max_entries, positive_ttl_seconds)
+        self.negative_ttl = timedelta(seconds=negative_ttl_seconds)
+        self._stats["negative_hits"] = 0
+
+    @staticmethod
+    def make_key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _count_hit(self, tier, doc):
+        with self._lock:
+            self._stats[tier] += 1
+            if not doc["valid"]:
+                self._stats["negative_hits"] += 1
+
+    def get(self, url):
+        """Return the cached validation record for url, or None on a miss"""
+        return self._lookup(self.make_key(url))
+
+    def set(self, url, valid, status=None, content_type=None, content_length=None,
+            width=None, height=None):
+        """Store a validation outcome in both tiers and return the record"""
+        record = {
+            "url": url,
+            "valid": valid,
+            "status": status,
+            "content_type": content_type,
+            "content_length": content_length,
+            "width": width,
+            "height": height,
+        }
+        return self._store(self.make_key(url), record, None if valid else self.negative_ttl)
@@ -0,0 +1,27 @@
+import hashlib
+import json
+
+from utils.two_tier_cache import TwoTierCache
+
+
+class LLMResponseCache(TwoTierCache):
+    """Cache of LLM responses keyed by a hash of model, prompt and params"""
+
+    name = "LLM cache"
+
+    def __init__(self, collection, max_entries=500, ttl_seconds=7 * 24 * 3600):
+        super().__init__(collection, max_entries, ttl_seconds)
+
+    @staticmethod
+    def make_key(model_name, prompt, params=None):
+        payload = json.dumps([model_name, prompt, params or {}], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached text for key, or None on a miss"""
+        doc = self._lookup(key)
+        return doc["text"] if doc else None
+
+    def set(self, key, text):
+        """Store text in both tiers"""
+        self._store(key, {"text": text})
@@ -1,22 +1,139 @@
 import google.generativeai as genai
 import re
 import random
-from utils.db import product_knowledge_collection
+from utils.db import product_knowledge_collection, llm_cache_collection
 from config import Config
+from utils.concurrency import async_stage_limit
+from utils.rate_limiter import TokenBucket
+from utils.async_runner import run_coroutine
+from utils.llm_cache import LLMResponseCache
+from utils.text_cleanup import (
+    GENERATION_ARTIFACTS, META_COMMENTARY, CODE_FENCES, INSTRUCTION_ARTIFACTS,
+    HTML_ARTIFACTS, HTML_WHITESPACE, STRONG_MARKDOWN, EM_MARKDOWN, STRAY_ASTERISKS,
+    NUMBERED_ITEM, NUMBERED_ITEM_PREFIX, BULLET_ITEM_PREFIX,
+)
+import asyncio
+import contextvars
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared across all generators so the Gemini quota is respected process-wide
+gemini_rate_limiter = TokenBucket(
+    rate=Config.GEMINI_REQUESTS_PER_MINUTE / 60.0,
+    capacity=Config.GEMINI_BURST,
+)
+
+# Shared response cache; hit/miss counters are exposed at /api/llm-cache/stats
+llm_response_cache = LLMResponseCache(
+    llm_cache_collection,
+    max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
+)
+
+# Set while a caller asked for fresh output; read by _generate_text
+_regenerating = contextvars.ContextVar("regenerating", default=False)
+
+
+@contextmanager
+def regenerating(enabled=True):
+    """Generate fresh text for every prompt issued in this block.
+
+    Cache lookups are skipped, and the new responses replace the cached
+    ones, so later requests get the regenerated text.
+    """
+    token = _regenerating.set(enabled)
+    try:
+        yield
+    finally:
+        _regenerating.reset(token)
 
 
 class BlogGenerator:
+    # Blog generation steps as a DAG: each step lists the blog_data fields it
+    # needs and the fields it produces. Insertion order is the classic
+    # step-by-step order used by the manual UI.
+    STEP_GRAPH = {
+        "title_tag": {"requires": [], "provides": ["title"]},
+        "h1_heading": {"requires": ["title"], "provides": ["h1"]},
+        "opening_paragraph": {"requires": ["title", "h1"], "provides": ["opening_paragraph"]},
+        "subheadings": {"requires": ["title"], "provides": ["subheadings"]},
+        "content_sections": {"requires": ["subheadings"], "provides": ["content_sections"]},
+        "cta": {"requires": ["title"], "provides": ["cta"]},
+        "conclusion": {"requires": ["title", "subheadings"], "provides": ["conclusion"]},
+        "quality_check": {
+            "requires": ["h1", "opening_paragraph", "content_sections", "cta", "conclusion"],
+            "provides": ["quality_checked"],
+        },
+        "finalize": {"requires": ["quality_checked"], "provides": []},
+    }
+
+    # 1-based position of each step, used for the session's current_step
+    STEP_NUMBERS = {step: i + 1 for i, step in enumerate(STEP_GRAPH)}
+
+    @classmethod
+    def missing_step_inputs(cls, step, blog_data):
+        """Return the blog_data fields a step still needs"""
+        return [field for field in cls.STEP_GRAPH[step]["requires"] if field not in blog_data]
+
+    @classmethod
+    def is_step_complete(cls, step, blog_data):
+        """A step is complete once everything it provides is in blog_data"""
+        provides = cls.STEP_GRAPH[step]["provides"]
+        return bool(provides) and all(field in blog_data for field in provides)
+
+    @classmethod
+    def ready_steps(cls, pending, blog_data):
+        """Return the pending steps whose inputs are all available"""
+        return [step for step in pending if not cls.missing_step_inputs(step, blog_data)]
+
     def __init__(self):
         if not Config.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
 
         genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel("gemini-2.0-flash-exp")
+        self.model_name = "gemini-2.0-flash-exp"
+        self.model = genai.GenerativeModel(self.model_name)
         self.product_knowledge = self._load_product_knowledge()
+        self._knowledge_version = self._product_knowledge_version()
+        self._knowledge_checked_at = time.monotonic()
+        self._knowledge_lock = threading.Lock()
         print("Gemini Flash 2.0 initialized successfully!")  # Keep generic message
 
+    def _product_knowledge_version(self):
+        """Cheap fingerprint of the product_knowledge document (id, version, updated_at)"""
+        try:
+            doc = product_knowledge_collection.find_one({}, {"version": 1, "updated_at": 1})
+        except Exception as e:
+            print(f"Error checking product knowledge version: {str(e)}")
+            # Treat as unchanged rather than reloading on every failed check
+            return getattr(self, "_knowledge_version", None)
+        if not doc:
+            return None
+        return (doc.get("_id"), doc.get("version"), doc.get("updated_at"))
+
+    def refresh_product_knowledge_if_stale(self):
+        """Reload product knowledge if its document changed since the last check.
+
+        The version check itself runs at most once every
+        PRODUCT_KNOWLEDGE_REFRESH_SECONDS, so warm generators cost no DB
+        round trip on most calls.
+        """
+        with self._knowledge_lock:
+            now = time.monotonic()
+            if now - self._knowledge_checked_at < Config.PRODUCT_KNOWLEDGE_REFRESH_SECONDS:
+                return
+            self._knowledge_checked_at = now
+
+            version = self._product_knowledge_version()
+            if version != self._knowledge_version:
+                print("Product knowledge changed, reloading")
+                # Swap the whole dict so concurrent readers never see a partial update
+                self.product_knowledge = self._load_product_knowledge()
+                self._knowledge_version = version
+
     def _load_product_knowledge(self):
         """Load product knowledge from MongoDB"""
         try:
@@ -67,11 +184,9 @@ class BlogGenerator:
             "research_link": "https://www.shothik.ai/research",
         }
 
-    def _generate_text(self, prompt):
-        """Generate text using Gemini with improved prompting to avoid HTML artifacts"""
-        try:
-            # Add system instruction to avoid HTML artifacts and markers
-            enhanced_prompt = f"""SYSTEM INSTRUCTION: You are a professional content writer. Generate clean, readable content using proper HTML formatting when needed. 
+    def _build_generation_prompt(self, prompt):
+        """Wrap a user prompt with the system instruction that avoids HTML artifacts"""
+        return f"""SYSTEM INSTRUCTION: You are a professional content writer. Generate clean, readable content using proper HTML formatting when needed. 
 
     IMPORTANT RULES:
     - Do NOT include HTML document structure (no <!DOCTYPE>, <html>, <head>, <body> tags)
@@ -85,8 +200,31 @@ class BlogGenerator:
 
     Generate clean, professional content that can be directly inserted into a webpage."""
 
-            response = self.model.generate_content(enhanced_prompt)
-            time.sleep(0.5)
+    async def _generate_text_async(self, prompt, use_cache=True, regenerate=False):
+        """Generate text using the async Gemini API, paced by the shared token bucket.
+
+        Responses are served from llm_response_cache when possible; pass
+        regenerate=True to skip the lookup but still cache the fresh
+        response, or use_cache=False to bypass the cache entirely.
+        """
+        try:
+            enhanced_prompt = self._build_generation_prompt(prompt)
+
+            use_cache = use_cache and Config.LLM_CACHE_ENABLED
+            loop = asyncio.get_running_loop()
+            if use_cache:
+                cache_key = llm_response_cache.make_key(self.model_name, enhanced_prompt)
+            if use_cache and not regenerate:
+                # The persistent tier is a blocking MongoDB call; keep it off the loop
+                cached = await loop.run_in_executor(None, llm_response_cache.get, cache_key)
+                if cached is not None:
+                    return cached
+
+            # The token bucket enforces our quota; the stage limit bounds how
+            # many requests are open at once
+            async with async_stage_limit('gemini'):
+                await gemini_rate_limiter.acquire_async()
+                response = await self.model.generate_content_async(enhanced_prompt)
             
             generated_text = response.text.strip()
             
@@ -94,56 +232,31 @@ class BlogGenerator:
             generated_text = self._clean_generation_artifacts(generated_text)
             generated_text = self._clean_asterisk_formatting(generated_text)
             
+            if use_cache and generated_text:
+                await loop.run_in_executor(None, llm_response_cache.set, cache_key, generated_text)
+            
             return generated_text
         except Exception as e:
             print(f"Generation error: {str(e)}")
             return ""
 
+    def _generate_text(self, prompt, use_cache=True):
+        """Generate text using Gemini with improved prompting to avoid HTML artifacts.
+
+        Sync wrapper over _generate_text_async; the request runs on the shared
+        event loop so prompts from every thread and session are pipelined.
+        Inside a regenerating() block the cached response is not reused.
+        """
+        return run_coroutine(
+            self._generate_text_async(prompt, use_cache=use_cache, regenerate=_regenerating.get())
+        )
+
     def _clean_generation_artifacts(self, content):
         """Remove common generation artifacts including HTML tag fragments"""
         if not content:
             return ""
         
-        # Remove HTML document artifacts
-        artifacts_to_remove = [
-            r"^html\s*\n?",
-            r"^HTML\s*\n?", 
-            r"^```html\s*\n?",
-            r"^```\s*\n?",
-            r"```html\s*$",
-            r"```\s*$",
-            r"^<!DOCTYPE[^>]*>\s*\n?",
-            r"^<html[^>]*>\s*\n?",
-            r"^<head[^>]*>.*?</head>\s*\n?",
-            r"^<body[^>]*>\s*\n?",
-            r"</body>\s*\n?$",
-            r"</html>\s*\n?$"
-        ]
-        
-        # Add HTML tag fragment patterns
-        tag_fragments = [
-            r"^h1>\s*",           # Remove "h1>" at start
-            r"^</h1>\s*",         # Remove "</h1>" at start  
-            r"^h2>\s*",           # Remove "h2>" at start
-            r"^</h2>\s*",         # Remove "</h2>" at start
-            r"^h3>\s*",           # Remove "h3>" at start
-            r"^</h3>\s*",         # Remove "</h3>" at start
-            r"^p>\s*",            # Remove "p>" at start
-            r"^</p>\s*",          # Remove "</p>" at start
-            r"^div>\s*",          # Remove "div>" at start
-            r"^</div>\s*",        # Remove "</div>" at start
-            r"^\w+>\s*",          # Remove any word followed by ">" at start
-        ]
-        
-        # Apply all artifact removal patterns
-        for pattern in artifacts_to_remove + tag_fragments:
-            content = re.sub(pattern, "", content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove any remaining HTML tag fragments (more general approach)
-        content = re.sub(r"^[a-zA-Z0-9]+>\s*", "", content)  # Remove tag remnants like "h1>", "div>", etc.
-        content = re.sub(r"^</[a-zA-Z0-9]+>\s*", "", content)  # Remove closing tag remnants like "</h1>", "</div>", etc.
-        
-        return content.strip()
+        return GENERATION_ARTIFACTS(content).strip()
 
     def generate_title_tag(self, main_keyword, additional_keywords, scraped_content):
         """Generate SEO-optimized title tag with keywords"""
@@ -422,6 +535,72 @@ Generate ONLY the opening paragraph with proper formatting."""
 
         return content
 
+    def generate_content_sections(self, subheadings, scraped_content, main_keyword, keywords):
+        """Generate every content section concurrently, keeping subheading order.
+
+        Sections only depend on their subheading, the scraped snippets and the
+        keywords, so they are independent Gemini calls; the 'gemini' stage
+        limit still bounds how many run at once process-wide.
+        """
+        scraped_snippets = []
+
+        # Extract snippets from scraped content
+        if scraped_content and "scraped_data" in scraped_content:
+            for keyword_data in scraped_content["scraped_data"].values():
+                if isinstance(keyword_data, list):
+                    for item in keyword_data:
+                        if "snippet" in item:
+                            scraped_snippets.append(item["snippet"])
+
+        # Calculate word distribution
+        # Opening: 150-200, Conclusion: 150-200, CTA: 150-200
+        # Remaining for content sections: 1200-1400 words
+        num_sections = len(subheadings)
+        words_per_section = (
+            350 if num_sections == 4 else 300
+        )  # Aim for 300-350 per section
+
+        def build_section(i, subheading):
+            # Use different context for each section
+            context = (
+                " ".join(scraped_snippets[i * 2 : (i + 1) * 2])
+                if scraped_snippets
+                else ""
+            )
+
+            # Assign keywords to sections
+            section_keywords = [main_keyword]
+            if i < len(keywords):
+                section_keywords.append(keywords[i])
+
+            content = self.generate_content_section(
+                subheading,
+                context,
+                main_keyword,
+                section_keywords,
+                word_target=words_per_section,
+            )
+
+            # Add outbound links to some sections
+            if i % 2 == 1:  # Every other section
+                content = self.add_outbound_links(content)
+
+            return content
+
+        if not subheadings:
+            return []
+
+        # Pool threads do not inherit context variables (e.g. regenerating());
+        # each section runs in its own copy of the caller's context
+        context = contextvars.copy_context()
+
+        def build_section_in_context(i, subheading):
+            return context.copy().run(build_section, i, subheading)
+
+        # map() yields results in submission order, so sections stay aligned with subheadings
+        with ThreadPoolExecutor(max_workers=num_sections) as executor:
+            return list(executor.map(build_section_in_context, range(num_sections), subheadings))
+
     def add_internal_links(self, content):
         """Add Shothik AI internal links naturally"""
         link_opportunities = [
@@ -505,40 +684,7 @@ Generate ONLY the opening paragraph with proper formatting."""
         if not content:
             return ""
         
-        # Remove common meta-commentary patterns
-        meta_patterns = [
-            r'\*\*[^*]+\*\*[^*]*explanation[^.]*\.',
-            r'Key improvements and explanations:.*',
-            r'The code is properly formatted.*',
-            r'Uses Font Awesome icons.*',
-            r'Added.*target="_blank".*',
-            r'This is generally good UX.*',
-            r'Benefits Page Link.*',
-            r'Contact Information Formatting.*',
-            r'CSS Styling.*',
-            r'Complete and Working.*',
-            r'Word Count.*',
-            r'Emoji Usage.*',
-            r'Improved Tone.*',
-            r'Emphasis on Action.*',
-            r'Mobile-Friendly.*',
-            r'The critical addition is.*',
-            r'.*adheres to all requirements.*',
-            r'.*incorporates best practices.*',
-            r'.*FontAwesome.*CSS.*',
-        ]
-        
-        for pattern in meta_patterns:
-            content = re.sub(pattern, '', content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove any remaining asterisk explanations
-        content = re.sub(r'\*\s*\*\*[^*]+\*\*[^.]*\.', '', content, flags=re.DOTALL)
-        
-        # Clean up extra whitespace
-        content = re.sub(r'\n{3,}', '\n\n', content)
-        content = content.strip()
-        
-        return content
+        return META_COMMENTARY(content).strip()
 
     def generate_conclusion(self, title, main_keyword, key_points):
         """Generate strong conclusion WITHOUT the heading and without meta-commentary"""
@@ -583,21 +729,11 @@ Generate ONLY the opening paragraph with proper formatting."""
             return ""
         
         # Remove code block markers
-        text = re.sub(r'```[\w]*\n?', '', text)
-        text = re.sub(r'```', '', text)
+        text = CODE_FENCES(text)
         
         if remove_instructions:
             # Remove common instruction artifacts
-            instruction_patterns = [
-                r'Here are \d+ .+?:?\s*\n',
-                r'I\'ve created .+?:?\s*\n',
-                r'Below are .+?:?\s*\n',
-                r'The following .+?:?\s*\n',
-                r'^\d+\.\s*Here are.+?:\s*$',
-            ]
-            
-            for pattern in instruction_patterns:
-                text = re.sub(pattern, '', text, flags=re.MULTILINE | re.IGNORECASE)
+            text = INSTRUCTION_ARTIFACTS(text)
         
         return text.strip()    
     def analyze_blog_quality(self, blog_data, main_keyword, additional_keywords):
@@ -688,25 +824,13 @@ Generate ONLY the opening paragraph with proper formatting."""
             return ""
 
         # Remove HTML code block markers and artifacts
-        content = re.sub(r"```html\s*", "", content)
-        content = re.sub(r"```\s*", "", content)
-        content = re.sub(r"^html\s*", "", content)  # Remove standalone "html" at start
-        content = re.sub(r"\bhtml\b", "", content)  # Remove standalone "html" word
-        
-        # Remove other common artifacts
-        content = re.sub(r"^(DOCTYPE|doctype)\s*", "", content, flags=re.MULTILINE)
+        content = HTML_ARTIFACTS(content)
         
         # Use the safe asterisk cleaning method
         content = self._clean_asterisk_formatting(content)
 
-        # Remove excessive newlines
-        content = re.sub(r"\n{3,}", "\n\n", content)
-
-        # Fix spacing around tags
-        content = re.sub(r">\s+<", "><", content)
-
-        # Remove any remaining HTML artifacts at the beginning
-        content = re.sub(r"^(html|HTML)\s*\n?", "", content)
+        # Remove excessive newlines, spacing between tags and a leading "html"
+        content = HTML_WHITESPACE(content)
         
         # Clean up whitespace
         content = content.strip()
@@ -732,18 +856,18 @@ Generate ONLY the opening paragraph with proper formatting."""
                     items = para.split("\n")
                     list_html = "<ul>\n"
                     for item in items:
-                        clean_item = re.sub(r"^[•\-]\s*", "", item.strip())
+                        clean_item = BULLET_ITEM_PREFIX.sub("", item.strip())
                         if clean_item:
                             list_html += f"            <li>{clean_item}</li>\n"
                     list_html += "        </ul>"
                     formatted_parts.append(list_html)
 
-                elif re.match(r"^\d+\.", para):
+                elif NUMBERED_ITEM.match(para):
                     # Numbered list
                     items = para.split("\n")
                     list_html = "<ol>\n"
                     for item in items:
-                        clean_item = re.sub(r"^\d+\.\s*", "", item.strip())
+                        clean_item = NUMBERED_ITEM_PREFIX.sub("", item.strip())
                         if clean_item:
                             list_html += f"            <li>{clean_item}</li>\n"
                     list_html += "        </ol>"
@@ -763,7 +887,7 @@ Generate ONLY the opening paragraph with proper formatting."""
             return ""
         
         # Step 1: Convert **text** to <strong>text</strong>
-        content = re.sub(r'\*\*([^*]+?)\*\*', r'<strong>\1</strong>', content)
+        content = STRONG_MARKDOWN.sub(r'<strong>\1</strong>', content)
         
         # Step 2: Convert remaining single *text* to <em>text</em>
         # Use a simple approach that avoids complex lookbehinds
@@ -773,12 +897,12 @@ Generate ONLY the opening paragraph with proper formatting."""
         for i, part in enumerate(parts):
             if i == 0:
                 # First part - process normally
-                part = re.sub(r'\*([^*]+?)\*', r'<em>\1</em>', part)
+                part = EM_MARKDOWN.sub(r'<em>\1</em>', part)
             else:
                 # Parts after <strong> - be more careful
                 if '</strong>' in part:
                     before_strong, after_strong = part.split('</strong>', 1)
-                    after_strong = re.sub(r'\*([^*]+?)\*', r'<em>\1</em>', after_strong)
+                    after_strong = EM_MARKDOWN.sub(r'<em>\1</em>', after_strong)
                     part = before_strong + '</strong>' + after_strong
                 
             processed_parts.append(part)
@@ -786,7 +910,7 @@ Generate ONLY the opening paragraph with proper formatting."""
         content = '<strong>'.join(processed_parts)
         
         # Step 3: Clean up any remaining problematic asterisks
-        content = re.sub(r'\*+', '', content)  # Remove any remaining asterisks
+        content = STRAY_ASTERISKS.sub('', content)  # Remove any remaining asterisks
         
         return content       
 
@@ -1708,3 +1832,21 @@ Generate ONLY the opening paragraph with proper formatting."""
     </html>"""
 
         return html
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_blog_generator():
+    """Return the process-wide BlogGenerator, creating it on first use.
+
+    The Gemini model and product knowledge stay warm across requests;
+    product knowledge is reloaded when its document changes.
+    """
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = BlogGenerator()
+    _generator.refresh_product_knowledge_if_stale()
+    return _generator
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from both threads and coroutines.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each acquire reserves one token immediately and then waits out any
+    deficit, so callers are served in arrival order without busy-waiting.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
@@ -1,10 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
-import time
 import re
 from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.http_client import polite_get
+from utils.html_parsing import make_soup
+from utils.db import serp_cache_collection
+from utils.serp_cache import SerpCache
+
+# Shared across scrapes; counters are exposed at /api/serp-cache/stats
+serp_cache = SerpCache(
+    serp_cache_collection,
+    max_entries=Config.SERP_CACHE_MAX_ENTRIES,
+    freshness_seconds=Config.SERP_CACHE_FRESHNESS_SECONDS,
+)
 
 class WeldingScraper:  # Keep the same class name for compatibility
+    ENGINE_LABELS = {'duckduckgo': 'DuckDuckGo', 'bing': 'Bing'}
+    
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -22,67 +34,92 @@ class WeldingScraper:  # Keep the same class name for compatibility
         """Check if content is relevant - for generic scraping, all content is relevant"""
         return True  # Accept all content for generic blogs
     
-    def scrape_duckduckgo(self, query):
-        """Scrape DuckDuckGo search results"""
+    def _fetch_duckduckgo(self, query):
+        """Fetch and parse DuckDuckGo search results"""
+        # Keep the query as-is for generic topics
+        url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
+        
+        response = polite_get(url, headers=self.headers, timeout=10)
+        return self._parse_duckduckgo(response.text)
+    
+    def _parse_duckduckgo(self, markup):
+        """Extract up to five results from a DuckDuckGo HTML results page"""
         results = []
-        try:
-            # Keep the query as-is for generic topics
-            url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(markup, 'div', class_='web-result')
+        
+        for result in soup.find_all('div', class_='web-result', limit=5):
+            title_elem = result.find('h2', class_='result__title')
+            snippet_elem = result.find('a', class_='result__snippet')
             
-            for result in soup.find_all('div', class_='web-result', limit=5):
-                title_elem = result.find('h2', class_='result__title')
-                snippet_elem = result.find('a', class_='result__snippet')
+            if title_elem and snippet_elem:
+                title = self.clean_text(title_elem.get_text())
+                snippet = self.clean_text(snippet_elem.get_text())
                 
-                if title_elem and snippet_elem:
-                    title = self.clean_text(title_elem.get_text())
-                    snippet = self.clean_text(snippet_elem.get_text())
-                    
-                    results.append({
-                        'title': title,
-                        'snippet': snippet,
-                        'source': 'DuckDuckGo'
-                    })
-            
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"Error scraping DuckDuckGo: {str(e)}")
+                results.append({
+                    'title': title,
+                    'snippet': snippet,
+                    'source': 'DuckDuckGo'
+                })
         
         return results
     
-    def scrape_bing(self, query):
-        """Scrape Bing search results"""
+    def _fetch_bing(self, query):
+        """Fetch and parse Bing search results"""
+        url = f"https://www.bing.com/search?q={quote_plus(query)}"
+        
+        response = polite_get(url, headers=self.headers, timeout=10)
+        return self._parse_bing(response.text)
+    
+    def _parse_bing(self, markup):
+        """Extract up to five results from a Bing results page"""
         results = []
-        try:
-            url = f"https://www.bing.com/search?q={quote_plus(query)}"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(markup, 'li', class_='b_algo')
+        
+        for result in soup.find_all('li', class_='b_algo', limit=5):
+            title_elem = result.find('h2')
+            snippet_elem = result.find('div', class_='b_caption')
             
-            for result in soup.find_all('li', class_='b_algo', limit=5):
-                title_elem = result.find('h2')
-                snippet_elem = result.find('div', class_='b_caption')
+            if title_elem and snippet_elem:
+                title = self.clean_text(title_elem.get_text())
+                snippet = self.clean_text(snippet_elem.get_text())
                 
-                if title_elem and snippet_elem:
-                    title = self.clean_text(title_elem.get_text())
-                    snippet = self.clean_text(snippet_elem.get_text())
-                    
-                    results.append({
-                        'title': title,
-                        'snippet': snippet,
-                        'source': 'Bing'
-                    })
-            
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"Error scraping Bing: {str(e)}")
+                results.append({
+                    'title': title,
+                    'snippet': snippet,
+                    'source': 'Bing'
+                })
         
         return results
     
+    def _search(self, engine, query):
+        """Return (results, from_cache) for one engine and query.
+        
+        Fresh results come from serp_cache without touching the network or
+        the parser. Failed or empty fetches are not cached.
+        """
+        if Config.SERP_CACHE_ENABLED:
+            cached = serp_cache.get(engine, query)
+            if cached is not None:
+                return cached, True
+        
+        results = []
+        try:
+            results = getattr(self, f'_fetch_{engine}')(query)
+            if results and Config.SERP_CACHE_ENABLED:
+                serp_cache.set(engine, query, results)
+        except Exception as e:
+            print(f"Error scraping {self.ENGINE_LABELS[engine]}: {str(e)}")
+        
+        return results, False
+    
+    def scrape_duckduckgo(self, query):
+        """Scrape DuckDuckGo search results"""
+        return self._search('duckduckgo', query)[0]
+    
+    def scrape_bing(self, query):
+        """Scrape Bing search results"""
+        return self._search('bing', query)[0]
+    
     def scrape_welding_specific_sites(self, keyword):
         """Generic site scraping - renamed but kept for compatibility"""
         # For generic blogs, we don't scrape specific sites
@@ -126,7 +163,11 @@ class WeldingScraper:  # Keep the same class name for compatibility
         }
     
     def scrape_for_keywords(self, main_keyword, keywords):
-        """Main scraping method for all keywords"""
+        """Main scraping method for all keywords.
+
+        Every (keyword, engine) fetch runs concurrently; politeness is enforced
+        per host by utils.http_client.host_throttle instead of global sleeps.
+        """
         all_results = {
             'main_keyword': main_keyword,
             'keywords': keywords,
@@ -134,29 +175,35 @@ class WeldingScraper:  # Keep the same class name for compatibility
             'total_results': 0
         }
         
-        # Scrape for main keyword
-        print(f"Scraping for main keyword: {main_keyword}")
-        main_results = []
-        main_results.extend(self.scrape_duckduckgo(main_keyword))
-        main_results.extend(self.scrape_bing(main_keyword))
-        # Skip welding-specific sites for generic topics
-        main_results.append(self.generate_smart_weld_context(main_keyword))
-        
-        all_results['scraped_data']['main'] = main_results
-        all_results['total_results'] += len(main_results)
-        
-        # Scrape for each additional keyword
-        for keyword in keywords:
-            print(f"Scraping for keyword: {keyword}")
-            keyword_results = []
-            
-            keyword_results.extend(self.scrape_duckduckgo(keyword))
-            keyword_results.extend(self.scrape_bing(keyword))
-            keyword_results.append(self.generate_smart_weld_context(keyword))
-            
-            all_results['scraped_data'][keyword] = keyword_results
-            all_results['total_results'] += len(keyword_results)
+        # 'main' holds the main keyword's results, as before
+        queries = [('main', main_keyword)] + [(keyword, keyword) for keyword in keywords]
+        engines = list(self.ENGINE_LABELS)
+        cache_hits = 0
+        
+        print(f"Scraping for main keyword: {main_keyword} and keywords: {keywords}")
+        with ThreadPoolExecutor(max_workers=Config.SCRAPE_MAX_WORKERS) as executor:
+            futures = {
+                (label, engine): executor.submit(self._search, engine, query)
+                for label, query in queries
+                for engine in engines
+            }
             
-            time.sleep(2)
+            for label, query in queries:
+                keyword_results = []
+                for engine in engines:
+                    results, from_cache = futures[(label, engine)].result()
+                    keyword_results.extend(results)
+                    cache_hits += from_cache
+                keyword_results.append(self.generate_smart_weld_context(query))
+                
+                all_results['scraped_data'][label] = keyword_results
+                all_results['total_results'] += len(keyword_results)
+        
+        lookups = len(futures)
+        all_results['serp_cache'] = {
+            'lookups': lookups,
+            'hits': cache_hits,
+            'hit_rate': round(cache_hits / lookups, 4) if lookups else 0
+        }
         
-        return all_results
\ No newline at end of file
+        return all_results
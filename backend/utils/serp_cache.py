@@ -0,0 +1,40 @@
+import hashlib
+import re
+
+from utils.two_tier_cache import TwoTierCache
+
+
+class SerpCache(TwoTierCache):
+    """Cache of parsed search-engine results keyed by engine and normalized query.
+
+    Stores the ``{title, snippet, source}`` lists produced by WeldingScraper so
+    repeated keywords skip both the fetch and the HTML parse. Entries are
+    fresh for ``freshness_seconds``.
+    """
+
+    name = "SERP cache"
+
+    def __init__(self, collection, max_entries=1000, freshness_seconds=24 * 3600):
+        super().__init__(collection, max_entries, freshness_seconds)
+
+    @staticmethod
+    def normalize_query(query):
+        return re.sub(r'\s+', ' ', query or '').strip().lower()
+
+    @classmethod
+    def make_key(cls, engine, query):
+        payload = f"{engine}:{cls.normalize_query(query)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, engine, query):
+        """Return a copy of the cached results, or None on a miss"""
+        doc = self._lookup(self.make_key(engine, query))
+        return [dict(item) for item in doc["results"]] if doc else None
+
+    def set(self, engine, query, results):
+        """Store parsed results in both tiers"""
+        self._store(self.make_key(engine, query), {
+            "engine": engine,
+            "query": self.normalize_query(query),
+            "results": [dict(item) for item in results],
+        })
@@ -0,0 +1,157 @@
+import re
+
+# Cleanup rules for LLM output, compiled once at import. Each pipeline runs its
+# rules in the same order the generator always applied them. Rules are only
+# merged into one alternation where that provably gives the same result as
+# running them one after another; the comments on each merge say why.
+
+
+class CleanupPipeline:
+    """An ordered list of precompiled regex substitutions applied in sequence"""
+
+    def __init__(self, rules, flags=0):
+        # rules: pattern, (pattern, replacement) or (pattern, replacement, flags)
+        self.rules = []
+        for rule in rules:
+            if isinstance(rule, str):
+                rule = (rule, "")
+            pattern, replacement = rule[0], rule[1]
+            rule_flags = rule[2] if len(rule) > 2 else flags
+            self.rules.append((re.compile(pattern, rule_flags), replacement))
+
+    def __call__(self, text):
+        for pattern, replacement in self.rules:
+            text = pattern.sub(replacement, text)
+        return text
+
+
+def _truncate_at_any(*phrases):
+    """Rule deleting from the first occurrence of any phrase to the end.
+
+    Equivalent to one ``phrase.*`` rule per phrase (DOTALL) as long as no
+    earlier phrase can start inside a later one's match, which the callers
+    guarantee by splitting phrase lists where that could happen.
+    """
+    return "(?:" + "|".join(re.escape(phrase) for phrase in phrases) + ").*"
+
+
+# _clean_generation_artifacts: every rule is anchored to the start or end of
+# the text and may expose the next rule's match, so none are merged.
+GENERATION_ARTIFACTS = CleanupPipeline(
+    [
+        # HTML document artifacts
+        r"^html\s*\n?",
+        r"^HTML\s*\n?",
+        r"^```html\s*\n?",
+        r"^```\s*\n?",
+        r"```html\s*$",
+        r"```\s*$",
+        r"^<!DOCTYPE[^>]*>\s*\n?",
+        r"^<html[^>]*>\s*\n?",
+        r"^<head[^>]*>.*?</head>\s*\n?",
+        r"^<body[^>]*>\s*\n?",
+        r"</body>\s*\n?$",
+        r"</html>\s*\n?$",
+        # HTML tag fragments at the start
+        r"^h1>\s*",
+        r"^</h1>\s*",
+        r"^h2>\s*",
+        r"^</h2>\s*",
+        r"^h3>\s*",
+        r"^</h3>\s*",
+        r"^p>\s*",
+        r"^</p>\s*",
+        r"^div>\s*",
+        r"^</div>\s*",
+        r"^\w+>\s*",
+        # Any remaining tag remnants like "h1>" or "</div>"
+        (r"^[a-zA-Z0-9]+>\s*", "", 0),
+        (r"^</[a-zA-Z0-9]+>\s*", "", 0),
+    ],
+    flags=re.DOTALL | re.IGNORECASE,
+)
+
+# _clean_meta_commentary: nineteen passes merged into nine. The phrase rules
+# cut the text at the phrase; they are grouped wherever an earlier phrase
+# cannot begin inside a later one ("Word Count" ends where "This is..."
+# could start, "Improved Tone" where "Emoji Usage" could), so each group
+# cuts at the same place the individual rules would have.
+META_COMMENTARY = CleanupPipeline(
+    [
+        r"\*\*[^*]+\*\*[^*]*explanation[^.]*\.",
+        _truncate_at_any(
+            "Key improvements and explanations:",
+            "The code is properly formatted",
+            "Uses Font Awesome icons",
+        ),
+        r'Added.*target="_blank".*',
+        _truncate_at_any(
+            "This is generally good UX",
+            "Benefits Page Link",
+            "Contact Information Formatting",
+            "CSS Styling",
+            "Complete and Working",
+        ),
+        _truncate_at_any("Word Count", "Emoji Usage"),
+        _truncate_at_any(
+            "Improved Tone",
+            "Emphasis on Action",
+            "Mobile-Friendly",
+            "The critical addition is",
+        ),
+        # Each of these emptied the whole text when it matched anywhere, so
+        # one anchored alternation does the same in a single attempt
+        r"\A.*(?:adheres to all requirements|incorporates best practices|FontAwesome.*CSS).*",
+        # Remaining asterisk explanations
+        (r"\*\s*\*\*[^*]+\*\*[^.]*\.", "", re.DOTALL),
+        # Extra blank lines
+        (r"\n{3,}", "\n\n", 0),
+    ],
+    flags=re.DOTALL | re.IGNORECASE,
+)
+
+# _clean_llm_output. Removing a fence can join stray backticks into a new
+# one, so the bare ``` pass stays separate.
+CODE_FENCES = CleanupPipeline([r"```[\w]*\n?", r"```"])
+
+# Instruction lines; a removal can pull the next line into a later rule's
+# match, so the order is kept
+INSTRUCTION_ARTIFACTS = CleanupPipeline(
+    [
+        r"Here are \d+ .+?:?\s*\n",
+        r"I've created .+?:?\s*\n",
+        r"Below are .+?:?\s*\n",
+        r"The following .+?:?\s*\n",
+        r"^\d+\.\s*Here are.+?:\s*$",
+    ],
+    flags=re.MULTILINE | re.IGNORECASE,
+)
+
+# _clean_html_content, before and after asterisk conversion
+HTML_ARTIFACTS = CleanupPipeline(
+    [
+        r"```html\s*",
+        r"```\s*",
+        r"^html\s*",  # Standalone "html" at start
+        r"\bhtml\b",  # Standalone "html" word
+        (r"^(DOCTYPE|doctype)\s*", "", re.MULTILINE),
+    ]
+)
+
+HTML_WHITESPACE = CleanupPipeline(
+    [
+        (r"\n{3,}", "\n\n"),  # Excessive newlines
+        (r">\s+<", "><"),  # Spacing between tags
+        r"^(html|HTML)\s*\n?",  # Remaining "html" artifact at the beginning
+    ]
+)
+
+# _clean_asterisk_formatting
+STRONG_MARKDOWN = re.compile(r"\*\*([^*]+?)\*\*")
+EM_MARKDOWN = re.compile(r"\*([^*]+?)\*")
+STRAY_ASTERISKS = re.compile(r"\*+")
+
+# Plain-text list detection in _clean_html_content
+NUMBERED_ITEM = re.compile(r"^\d+\.")
+NUMBERED_ITEM_PREFIX = re.compile(r"^\d+\.\s*")
+BULLET_ITEM_PREFIX = re.compile(r"^[•\-]\s*")
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+class TwoTierCache:
+    """Memory LRU in front of a MongoDB collection, both honouring one expiry.
+
+    Entries are documents keyed by ``_id``. Each carries ``created_at`` and
+    ``expires_at``, and the collection removes expired documents through a
+    TTL index on ``expires_at``. The memory tier is bounded by entry count.
+    Persistent-tier failures are logged and treated as misses, so callers
+    never depend on the cache. Subclasses build the key and decide what the
+    document holds.
+    """
+
+    name = "Cache"  # Prefix for log messages
+
+    def __init__(self, collection, max_entries, ttl_seconds):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._entries = OrderedDict()  # key -> document
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "stores": 0}
+
+    def _remember(self, key, doc):
+        with self._lock:
+            self._entries[key] = doc
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count_hit(self, tier, doc):
+        with self._lock:
+            self._stats[tier] += 1
+
+    def _lookup(self, key):
+        """Return the unexpired document for key from either tier, or None"""
+        now = datetime.utcnow()
+
+        with self._lock:
+            doc = self._entries.get(key)
+            if doc:
+                if doc["expires_at"] > now:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    doc = None
+        if doc:
+            self._count_hit("memory_hits", doc)
+            return doc
+
+        try:
+            doc = self.collection.find_one({"_id": key, "expires_at": {"$gt": now}}, {"_id": 0})
+        except Exception as e:
+            print(f"{self.name} lookup failed: {str(e)}")
+            doc = None
+
+        if doc:
+            self._remember(key, doc)
+            self._count_hit("persistent_hits", doc)
+            return doc
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def _store(self, key, fields, ttl=None):
+        """Store fields under key in both tiers and return the document"""
+        now = datetime.utcnow()
+        doc = {**fields, "created_at": now, "expires_at": now + (ttl or self.ttl)}
+        self._remember(key, doc)
+
+        with self._lock:
+            self._stats["stores"] += 1
+
+        try:
+            self.collection.update_one({"_id": key}, {"$set": doc}, upsert=True)
+        except Exception as e:
+            print(f"{self.name} store failed: {str(e)}")
+
+        return doc
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["persistent_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0
+        return stats
@@ -0,0 +1,43 @@
+import io
+import zipfile
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands its bytes back on drain()"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """Yield a ZIP archive chunk by chunk from (arcname, data) pairs.
+
+    ``entries`` may be any iterable, e.g. a generator over a database
+    cursor. Each entry is compressed and yielded as soon as it is written,
+    so only one entry is held in memory at a time. Because the sink cannot
+    seek, zipfile writes sizes in data descriptors, which every unzip tool
+    supports.
+    """
+    sink = _ChunkBuffer()
+    with zipfile.ZipFile(sink, mode="w", compression=compression) as archive:
+        for arcname, data in entries:
+            archive.writestr(arcname, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Closing the archive writes the central directory
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
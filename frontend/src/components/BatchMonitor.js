@@ -3,64 +3,90 @@ import { batchAPI } from '../services/api';
 import BlogPreviewModal from './BlogPreviewModal';
 import './BatchMonitor.css';
 
+const TERMINAL_STATUSES = ['completed_successfully', 'completed_with_errors', 'failed'];
+
 const BatchMonitor = ({ jobId, onClose, isRestored }) => {
   const [status, setStatus] = useState(null);
   const [results, setResults] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
-  const [autoRefresh, setAutoRefresh] = useState(true);
+  const [live, setLive] = useState(true);
   const [previewBlog, setPreviewBlog] = useState(null);
-  const [processingStages, setProcessingStages] = useState({});
+  const [inFlight, setInFlight] = useState({});
+  const [exporting, setExporting] = useState(false);
 
   useEffect(() => {
-    const fetchStatus = async () => {
+    // The server pushes one snapshot, then only stage and progress deltas
+    const source = batchAPI.openBatchEvents(jobId);
+    const parse = (event) => JSON.parse(event.data);
+
+    source.addEventListener('snapshot', (event) => {
+      const {
+        results: snapshotResults,
+        results_offset: resultsOffset,
+        in_flight: snapshotInFlight,
+        ...snapshotStatus
+      } = parse(event);
+      setStatus(snapshotStatus);
+      // After a reconnect the snapshot only holds results we have not seen
+      setResults(prev => [...prev.slice(0, resultsOffset || 0), ...(snapshotResults || [])]);
+      setInFlight(snapshotInFlight || {});
+      setError('');
+      setLoading(false);
+    });
+
+    source.addEventListener('stage', (event) => {
+      const { item_id, main_keyword, stage } = parse(event);
+      setInFlight(prev => ({ ...prev, [item_id]: { main_keyword, stage } }));
+      setStatus(prev => prev && {
+        ...prev,
+        status: TERMINAL_STATUSES.includes(prev.status) ? prev.status : 'processing',
+        current_keyword: main_keyword,
+        current_stage: stage
+      });
+    });
+
+    source.addEventListener('progress', (event) => {
+      const progress = parse(event);
+      setStatus(prev => ({ ...prev, ...progress }));
+    });
+
+    source.addEventListener('result', (event) => {
+      const result = parse(event);
+      setResults(prev => [...prev, result]);
+      setInFlight(prev => {
+        const { [result.item_id]: _finished, ...rest } = prev;
+        return rest;
+      });
+    });
+
+    source.addEventListener('done', (event) => {
+      const progress = parse(event);
+      setStatus(prev => ({ ...prev, ...progress }));
+      setInFlight({});
+      setLive(false);
+      source.close();
+    });
+
+    // EventSource reconnects by itself (and gets a snapshot of what it
+    // missed); only a closed stream, e.g. an unknown job, needs the error
+    // from the REST API
+    source.onerror = async () => {
+      if (source.readyState !== EventSource.CLOSED) return;
+      setLive(false);
       try {
         const response = await batchAPI.getBatchStatus(jobId);
-        setStatus(response);
-        
-        if (response.results) {
-          setResults(response.results);
-          
-          // Update processing stages for better UX
-          const stages = {};
-          response.results.forEach(result => {
-            if (result.status === 'processing') {
-              stages[result.main_keyword] = getProcessingStage(response.current_keyword, result.main_keyword);
-            }
-          });
-          setProcessingStages(stages);
-        }
-        
-        // Stop auto-refresh if job is complete
-        if (['completed_successfully', 'completed_with_errors', 'failed'].includes(response.status)) {
-          setAutoRefresh(false);
-        }
-        
-        setLoading(false);
+        const { results: statusResults, in_flight: statusInFlight, ...statusFields } = response;
+        setStatus(statusFields);
+        setResults(statusResults || []);
       } catch (err) {
         setError(err.response?.data?.error || 'Error fetching status');
-        setLoading(false);
       }
+      setLoading(false);
     };
 
-    fetchStatus();
-
-    let interval;
-    if (autoRefresh) {
-      interval = setInterval(fetchStatus, 3000);
-    }
-
-    return () => {
-      if (interval) clearInterval(interval);
-    };
-  }, [jobId, autoRefresh]);
-
-  const getProcessingStage = (currentKeyword, resultKeyword) => {
-    if (currentKeyword === resultKeyword) {
-      return 'active';
-    }
-    return 'waiting';
-  };
+    return () => source.close();
+  }, [jobId]);
 
   const getProcessingStageText = (stage, status) => {
     if (status === 'success') return 'Completed';
@@ -153,6 +179,25 @@ const BatchMonitor = ({ jobId, onClose, isRestored }) => {
     }
   };
 
+  const exportBatch = async () => {
+    setExporting(true);
+    try {
+      const blob = await batchAPI.exportBatch(jobId);
+      const url = window.URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url;
+      a.download = `${jobId}.zip`;
+      document.body.appendChild(a);
+      a.click();
+      window.URL.revokeObjectURL(url);
+      document.body.removeChild(a);
+    } catch (error) {
+      alert(`Error exporting batch: ${error.response?.data?.error || error.message}`);
+    } finally {
+      setExporting(false);
+    }
+  };
+
   const previewBlogContent = async (keywordId, keyword) => {
     try {
       const response = await batchAPI.previewBatchBlog(keywordId);
@@ -262,9 +307,21 @@ const BatchMonitor = ({ jobId, onClose, isRestored }) => {
             </div>
             <div className="current-keyword-info">
               <div className="current-keyword">{status.current_keyword}</div>
-              <div className="processing-stage">Generating comprehensive blog content...</div>
+              <div className="processing-stage">
+                {status.current_stage || 'Generating comprehensive blog content...'}
+              </div>
             </div>
           </div>
+
+          {Object.keys(inFlight).length > 1 && (
+            <ul className="in-flight-list">
+              {Object.entries(inFlight).map(([itemId, { main_keyword, stage }]) => (
+                <li key={itemId}>
+                  <strong>{main_keyword}</strong>: {stage}
+                </li>
+              ))}
+            </ul>
+          )}
           
           <div className="processing-steps">
             <div className="step-indicator">
@@ -310,13 +367,13 @@ const BatchMonitor = ({ jobId, onClose, isRestored }) => {
                     <td className="keyword-cell">{result.main_keyword}</td>
                     <td className="status-cell">
                       <span className={`status-badge ${result.status}`}>
-                        {getProcessingIcon(processingStages[result.main_keyword], result.status)}
+                        {getProcessingIcon(undefined, result.status)}
                         <span className="status-text">{result.status}</span>
                       </span>
                     </td>
                     <td className="progress-cell">
                       <div className="progress-text-small">
-                        {getProcessingStageText(processingStages[result.main_keyword], result.status)}
+                        {getProcessingStageText(undefined, result.status)}
                       </div>
                     </td>
                     <td className="id-cell">
@@ -393,14 +450,14 @@ const BatchMonitor = ({ jobId, onClose, isRestored }) => {
         </div>
       )}
 
-      {autoRefresh && (
+      {live && (
         <div className="auto-refresh-indicator">
           <div className="refresh-spinner"></div>
-          <span>Auto-refreshing every 3 seconds...</span>
+          <span>Receiving live updates...</span>
         </div>
       )}
 
-      {!autoRefresh && status && (
+      {!live && status && (
         <div className="final-summary">
           <h3>🎉 Batch Processing Complete!</h3>
           <div className="summary-stats">
@@ -415,6 +472,9 @@ const BatchMonitor = ({ jobId, onClose, isRestored }) => {
           {status.processed > 0 && (
             <div className="bulk-download-section">
               <h4>📦 Bulk Download Options</h4>
+              <button onClick={exportBatch} className="download-results-btn" disabled={exporting}>
+                {exporting ? '⏳ Preparing ZIP...' : '🗜️ Download All Blogs (ZIP)'}
+              </button>
               <p>Individual blog downloads are available in the results table above.</p>
             </div>
           )}
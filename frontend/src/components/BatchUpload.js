@@ -46,11 +46,11 @@ const BatchUpload = () => {
   };
 
   const handleFileSelect = (file) => {
-    if (file && (file.name.endsWith('.xlsx') || file.name.endsWith('.xls'))) {
+    if (file && /\.(xlsx|xls|csv)$/i.test(file.name)) {
       setSelectedFile(file);
       setError('');
     } else {
-      setError('Please select a valid Excel file (.xlsx or .xls)');
+      setError('Please select a valid Excel or CSV file (.xlsx, .xls or .csv)');
       setSelectedFile(null);
     }
   };
@@ -222,7 +222,7 @@ Industrial Welding Solutions,manufacturing welding,heavy industry,production wel
           <input
             ref={fileInputRef}
             type="file"
-            accept=".xlsx,.xls"
+            accept=".xlsx,.xls,.csv"
             onChange={handleFileChange}
             style={{ display: 'none' }}
           />
@@ -240,7 +240,7 @@ Industrial Welding Solutions,manufacturing welding,heavy industry,production wel
               <div className="upload-icon">📤</div>
               <p>Drag and drop your Excel file here</p>
               <p>or <span className="click-text">click to browse</span></p>
-              <small>Supports .xlsx and .xls files</small>
+              <small>Supports .xlsx, .xls and .csv files</small>
             </div>
           )}
         </div>
@@ -11,6 +11,8 @@ const BlogGenerator = ({ keywordId, onBlogGenerated }) => {
   const [error, setError] = useState('');
   const [existingBlog, setExistingBlog] = useState(null);
   const [showImageIntegration, setShowImageIntegration] = useState(false);
+  // Set by "Generate New Version" so steps skip the server's cached LLM responses
+  const [regenerate, setRegenerate] = useState(false);
 
   const steps = [
     { id: 'start', name: 'Start Generation', action: 'start' },
@@ -55,7 +57,8 @@ const BlogGenerator = ({ keywordId, onBlogGenerated }) => {
       } else {
         const response = await blogAPI.generateBlogStep(keywordId, {
           step: step.id,
-          session_id: sessionId
+          session_id: sessionId,
+          regenerate
         });
 
         if (response.result) {
@@ -218,6 +221,7 @@ const BlogGenerator = ({ keywordId, onBlogGenerated }) => {
                   setCurrentStep(0);
                   setExistingBlog(null);
                   setBlogData({});
+                  setRegenerate(true);
                 }}
                 className="regenerate-button"
               >
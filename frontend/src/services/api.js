@@ -126,6 +126,9 @@ export const batchAPI = {
     return response.data;
   },
   
+  // Subscribe to live stage and progress events for a batch job (server-sent events)
+  openBatchEvents: (jobId) => new EventSource(`${API_BASE_URL}/batch-events/${jobId}`),
+  
   // Get batch processing results
   getBatchResults: async (jobId) => {
     const response = await api.get(`/batch-results/${jobId}`);
@@ -153,6 +156,15 @@ export const batchAPI = {
     return response.data;
   },
 
+  // Export every completed blog in a batch as one ZIP (HTML, TXT and JSON)
+  exportBatch: async (jobId) => {
+    const response = await api.get(`/batch-export/${jobId}`, {
+      responseType: 'blob',
+      timeout: 300000, // 5 minute timeout; large batches stream for a while
+    });
+    return response.data;
+  },
+
   // Bulk download all completed blogs from a batch (if implemented)
   downloadAllBatchBlogs: async (jobId, format = 'html') => {
     const response = await api.get(`/batch-download-all/${jobId}/${format}`, {